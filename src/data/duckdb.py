@@ -1,21 +1,102 @@
+import hashlib
+from contextlib import contextmanager
+
 import duckdb
-from typing import Iterable
+import pandas as pd
+from typing import Iterable, Iterator
 from abc import ABC, abstractmethod
 from src.data.riot_api import Match  
+from src.utils.bloom_filter import BloomFilter
+
+
+MATCH_COLUMNS = [
+    "match_id_hash",
+    "match_id",
+    "game_creation",
+    "game_duration",
+    "game_end_timestamp",
+    "game_mode",
+    "game_start_timestamp",
+    "game_type",
+    "game_version",
+]
+MATCH_DTYPES = {
+    "match_id_hash": "uint64",
+    "game_creation": "Int64",
+    "game_duration": "Int64",
+    "game_end_timestamp": "Int64",
+    "game_start_timestamp": "Int64",
+}
+
+PARTICIPANT_COLUMNS = [
+    "match_id_hash",
+    "puuid_hash",
+    "match_id",
+    "puuid",
+    "champion",
+    "individual_position",
+    "team_position",
+    "team_id",
+    "win",
+    "rank_num",
+]
+PARTICIPANT_DTYPES = {
+    "match_id_hash": "uint64",
+    "puuid_hash": "uint64",
+    "team_id": "Int32",
+    "win": "boolean",
+    "rank_num": "Int8",  # nullable RANK_DTYPE
+}
+# Values of the position_t ENUM: Riot's positions, plus 'Invalid' and '' which show up
+# for remakes and odd queues. Anything else Riot sends (e.g. 'NONE') is stored as NULL
+# rather than failing the whole insert.
+POSITIONS = ("TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY", "Invalid", "")
+_KNOWN_POSITIONS = frozenset(POSITIONS)
+
+
+def id_hash(value: str) -> int:
+    """Hash a Riot identifier (match_id, puuid) to a stable unsigned 64-bit key."""
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "little")
+
 
+def _stage_insert_sql(table: str, key: list[str]) -> str:
+    """
+    Build the INSERT ... SELECT that moves rows from `<table>_stage` into a table.
+
+    Rows whose key already exists are skipped with an anti-join, which DuckDB plans as
+    a hash join rather than a unique-index probe per row like ON CONFLICT. The SQL is
+    built once at import; the Python client has no reusable prepared-statement handle.
+    """
+    key_columns = ", ".join(key)
+    return f"""
+        INSERT INTO {table}
+        SELECT DISTINCT ON ({key_columns}) s.*
+        FROM {table}_stage s
+        ANTI JOIN {table} t USING ({key_columns})
+    """
+
+
+INSERT_MATCHES_SQL = _stage_insert_sql("matches", ["match_id_hash"])
+INSERT_PARTICIPANTS_SQL = _stage_insert_sql("participants", ["match_id_hash", "puuid_hash"])
 
 class DuckDBBase(ABC):
     """Base class for DuckDB database managers."""
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, bulk_mode: bool = False):
         """
         Initialize database connection.
         
         Args:
             db_path: Path to the DuckDB database file
+            bulk_mode: Tune the connection for bulk ingest: checkpoint the WAL rarely
+                and once more on close, instead of every few MB of writes
         """
         self.db_path = db_path
+        self.bulk_mode = bulk_mode
+        self._in_transaction = False
         self.con = duckdb.connect(db_path)
+        if bulk_mode:
+            self.con.execute("SET checkpoint_threshold = '1GB'")
         self._init_schema()
     
     @abstractmethod
@@ -28,8 +109,42 @@ class DuckDBBase(ABC):
         """Remove all data from the database. Must be implemented by subclasses."""
         pass
     
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Run the block in a single transaction, rolling back on error.
+        
+        Nested calls join the outermost transaction, so helpers that write in their own
+        transaction can be grouped into one atomic commit by the caller.
+        """
+        if self._in_transaction:
+            yield
+            return
+        # Explicit transaction: `with self.con` would close the DuckDB connection on exit
+        self.con.begin()
+        self._in_transaction = True
+        try:
+            yield
+            self.con.commit()
+        except BaseException:
+            self.con.rollback()
+            self._after_rollback()
+            raise
+        finally:
+            self._in_transaction = False
+
+    def _after_rollback(self) -> None:
+        """Hook for subclasses to resync in-process state after a rolled back transaction."""
+        pass
+
+    def checkpoint(self) -> None:
+        """Flush the WAL into the database file."""
+        self.con.execute("CHECKPOINT")
+
     def close(self):
         """Close the database connection."""
+        if self.bulk_mode:
+            self.checkpoint()
         self.con.close()
     
     def __enter__(self):
@@ -44,19 +159,28 @@ class DuckDBBase(ABC):
 class MatchDatabase(DuckDBBase):
     """Database manager for League of Legends match data."""
     
-    def __init__(self, db_path: str = "data/match_data/matches.duckdb"):
+    def __init__(
+        self,
+        db_path: str = "data/match_data/matches.duckdb",
+        bulk_mode: bool = False,
+    ):
         """
         Initialize database connection.
         
         Args:
             db_path: Path to the DuckDB database file
+            bulk_mode: Tune the connection for bulk ingest (see DuckDBBase)
         """
-        super().__init__(db_path)
+        super().__init__(db_path, bulk_mode)
     
     def _init_schema(self):
         """Create tables and indexes if they don't exist."""
+        self._check_legacy_layout()
+        # Keys are fixed-width hashes of the Riot ids (see id_hash); the ids themselves are
+        # kept alongside for lookups and readability
         self.con.execute("""CREATE TABLE IF NOT EXISTS matches (
-            match_id TEXT PRIMARY KEY,
+            match_id_hash UBIGINT PRIMARY KEY,
+            match_id TEXT,
             game_creation BIGINT,
             game_duration BIGINT,
             game_end_timestamp BIGINT,
@@ -65,63 +189,153 @@ class MatchDatabase(DuckDBBase):
             game_type TEXT,
             game_version TEXT
         );""")
+        # No index on match_id: lookups go through match_id_hash (see get_only_new_match_ids),
+        # and the index only slowed bulk inserts. Files created with it have it dropped.
+        self.con.execute("DROP INDEX IF EXISTS idx_matches_match_id;")
+        positions = ", ".join(f"'{position}'" for position in POSITIONS)
+        self.con.execute(f"CREATE TYPE IF NOT EXISTS position_t AS ENUM ({positions});")
         self.con.execute("""CREATE TABLE IF NOT EXISTS participants (
+            match_id_hash UBIGINT,
+            puuid_hash UBIGINT,
             match_id TEXT,
             puuid TEXT,
             champion TEXT,
-            individual_position TEXT,
-            team_position TEXT,
+            individual_position position_t,
+            team_position position_t,
             team_id INTEGER,
             win BOOLEAN,
-            rank_num INTEGER,
-            PRIMARY KEY (match_id, puuid),
-            FOREIGN KEY (match_id) REFERENCES matches(match_id)
+            rank_num TINYINT,  -- 0..30, see RANK_DTYPE
+            -- No FOREIGN KEY on match_id: parent matches are always written in the same
+            -- transaction, so the per-row lookup into matches is redundant
+            PRIMARY KEY (match_id_hash, puuid_hash)
         );""")
         self.con.execute("CREATE INDEX IF NOT EXISTS idx_participants_puuid ON participants(puuid);")
         self.con.execute("CREATE INDEX IF NOT EXISTS idx_participants_champion ON participants(champion);")
+        # Match-ID query progress lives in the same file (see QueryProgressTracker)
+        self.con.execute("""CREATE TABLE IF NOT EXISTS query_progress (
+            platform TEXT,
+            start_time TEXT,
+            end_time TEXT,
+            puuid TEXT,
+            last_start_index INTEGER DEFAULT 0,
+            last_updated TIMESTAMP DEFAULT NOW(),
+            PRIMARY KEY (platform, start_time, end_time, puuid)
+        );""")
+        self.con.execute("CREATE INDEX IF NOT EXISTS idx_query_progress_lookup ON query_progress(platform, start_time, end_time, puuid);")
+        # In-process Bloom filter of stored match_ids so most new-ID checks skip DuckDB
+        self._load_known_match_ids()
+
+    def _check_legacy_layout(self) -> None:
+        """
+        Refuse database files created before the tables were keyed on id hashes.
+
+        CREATE TABLE IF NOT EXISTS leaves such tables as they are, and the first
+        upsert_many would then fail on the missing match_id_hash column, after the run
+        has already spent API budget fetching matches.
+        """
+        legacy_tables = [
+            table
+            for (table,) in self.con.execute("""
+                SELECT table_name
+                FROM information_schema.tables
+                WHERE table_name IN ('matches', 'participants')
+                  AND table_name NOT IN (
+                      SELECT table_name FROM information_schema.columns
+                      WHERE column_name = 'match_id_hash'
+                  )
+            """).fetchall()
+        ]
+        if legacy_tables:
+            self.con.close()
+            raise RuntimeError(
+                f"{self.db_path} uses the old match_id-keyed layout "
+                f"(tables without match_id_hash: {', '.join(sorted(legacy_tables))}). "
+                "Move or delete the file and re-run to recreate it with the current schema."
+            )
+
+    def _load_known_match_ids(self) -> None:
+        """(Re)build the in-process match_id filter from the matches table."""
+        match_ids = [row[0] for row in self.con.execute("SELECT match_id FROM matches").fetchall()]
+        # Leave room to grow before the filter is full and has to be rebuilt
+        self._known_match_ids = BloomFilter(capacity=max(2 * len(match_ids), 100_000))
+        self._known_match_ids.update(match_ids)
+
+    def _after_rollback(self) -> None:
+        """Drop match_ids cached by upserts that were part of the rolled back transaction."""
+        self._load_known_match_ids()
     
     def upsert_match(self, m: Match):
         """Upsert a single match into the database."""
-        # Insert the match; ignore if it already exists
-        self.con.execute("""
-            INSERT INTO matches (
-                match_id, game_creation, game_duration, game_end_timestamp,
-                game_mode, game_start_timestamp, game_type, game_version
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(match_id) DO NOTHING
-        """, [
-            m.match_id, m.game_creation, m.game_duration, m.game_end_timestamp,
-            m.game_mode, m.game_start_timestamp, m.game_type, m.game_version
-        ])
-
-        # Insert participants; ignore duplicates
-        rows = []
-        for p in m.participants:
-            rank_num = getattr(p, "rank_num", None)
-            # Convert Rank enum to its integer value for DuckDB
-            if rank_num is not None and hasattr(rank_num, 'value'):
-                rank_num = rank_num.value
-            rows.append([
-                m.match_id,
-                p.puuid,
-                p.champion,
-                p.individual_position,
-                p.team_position,
-                p.team_id,
-                p.win,
-                rank_num
-            ])
-        self.con.executemany("""
-            INSERT INTO participants (
-              match_id, puuid, champion, individual_position, team_position,
-              team_id, win, rank_num
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(match_id, puuid) DO NOTHING
-        """, rows)
+        self.upsert_many([m])
+
+    @staticmethod
+    def _append_match_columns(m: Match, columns: dict[str, list]) -> None:
+        """Append a match's fields onto the per-column lists of the matches table."""
+        columns["match_id_hash"].append(id_hash(m.match_id))
+        columns["match_id"].append(m.match_id)
+        columns["game_creation"].append(m.game_creation)
+        columns["game_duration"].append(m.game_duration)
+        columns["game_end_timestamp"].append(m.game_end_timestamp)
+        columns["game_mode"].append(m.game_mode)
+        columns["game_start_timestamp"].append(m.game_start_timestamp)
+        columns["game_type"].append(m.game_type)
+        columns["game_version"].append(m.game_version)
+
+    @staticmethod
+    def _append_participant_columns(m: Match, columns: dict[str, list]) -> None:
+        """Append a match's participants onto the per-column lists of the participants table."""
+        participants = m.participants
+
+        columns["match_id_hash"].extend([id_hash(m.match_id)] * len(participants))
+        columns["puuid_hash"].extend(id_hash(p.puuid) for p in participants)
+        columns["match_id"].extend([m.match_id] * len(participants))
+        columns["puuid"].extend(p.puuid for p in participants)
+        columns["champion"].extend(p.champion for p in participants)
+        columns["individual_position"].extend(
+            p.individual_position if p.individual_position in _KNOWN_POSITIONS else None
+            for p in participants
+        )
+        columns["team_position"].extend(
+            p.team_position if p.team_position in _KNOWN_POSITIONS else None
+            for p in participants
+        )
+        columns["team_id"].extend(p.team_id for p in participants)
+        columns["win"].extend(p.win for p in participants)
+        # Convert Rank enum to its integer value for DuckDB
+        columns["rank_num"].extend(
+            p.rank_num.value if p.rank_num is not None else None for p in participants
+        )
+
+    def _insert_frame(
+        self,
+        view: str,
+        sql: str,
+        columns: dict[str, list],
+        dtypes: dict[str, str],
+    ) -> None:
+        """
+        Insert column lists by registering them as a DataFrame view and running a
+        prebuilt INSERT ... SELECT over it (see _stage_insert_sql).
+
+        Columns are collected directly (rather than as rows) so the DataFrame, and
+        DuckDB's scan of it, need no row-to-column transpose, and the insert runs as one
+        vectorized statement instead of binding parameters row by row.
+        """
+        frame = pd.DataFrame(columns).astype(dtypes)
+        if frame.empty:
+            return
+        self.con.register(view, frame)
+        try:
+            self.con.execute(sql)
+        finally:
+            self.con.unregister(view)
 
     def upsert_many(self, matches: Iterable[Match]) -> int:
         """
         Upsert multiple matches into the database.
+
+        All rows are collected first so each table is written with a single
+        statement, regardless of how many matches are passed in.
         
         Args:
             matches: Iterable of Match objects to upsert
@@ -129,12 +343,24 @@ class MatchDatabase(DuckDBBase):
         Returns:
             Number of matches successfully upserted
         """
-        count = 0
-        with self.con:  # single transaction
-            for m in matches:
-                self.upsert_match(m)
-                count += 1
-        return count
+        match_columns: dict[str, list] = {column: [] for column in MATCH_COLUMNS}
+        participant_columns: dict[str, list] = {column: [] for column in PARTICIPANT_COLUMNS}
+        for m in matches:
+            self._append_match_columns(m, match_columns)
+            self._append_participant_columns(m, participant_columns)
+
+        with self.transaction():
+            self._insert_frame("matches_stage", INSERT_MATCHES_SQL, match_columns, MATCH_DTYPES)
+            self._insert_frame(
+                "participants_stage",
+                INSERT_PARTICIPANTS_SQL,
+                participant_columns,
+                PARTICIPANT_DTYPES,
+            )
+        self._known_match_ids.update(match_columns["match_id"])
+        if self._known_match_ids.is_full:
+            self._load_known_match_ids()
+        return len(match_columns["match_id"])
 
     def get_only_new_match_ids(self, match_ids: set[str]) -> set[str]:
         """
@@ -146,22 +372,23 @@ class MatchDatabase(DuckDBBase):
         Returns:
             Set of match_ids that are NOT in the database (i.e., new match_ids)
         """
-        if not match_ids:
-            return set()
-        
-        match_ids_list = list(match_ids)
-        placeholders = ','.join(['?' for _ in match_ids_list])
-        
-        query = f"""
-        SELECT match_id 
-        FROM matches 
-        WHERE match_id IN ({placeholders})
-        """
-        
-        result = self.con.execute(query, match_ids_list).fetchall()
-        existing_ids = {row[0] for row in result}
-        
-        return match_ids - existing_ids
+        # Ids the Bloom filter has never seen are definitely new. Its hits may be false
+        # positives, so only those are confirmed against the matches table.
+        maybe_known = [match_id for match_id in match_ids if match_id in self._known_match_ids]
+        if not maybe_known:
+            return set(match_ids)
+        candidates = pd.DataFrame(
+            {"match_id_hash": [id_hash(match_id) for match_id in maybe_known]}
+        ).astype({"match_id_hash": "uint64"})
+        self.con.register("candidate_matches", candidates)
+        try:
+            known = self.con.execute("""
+                SELECT match_id FROM matches
+                SEMI JOIN candidate_matches USING (match_id_hash)
+            """).fetchall()
+        finally:
+            self.con.unregister("candidate_matches")
+        return match_ids - {row[0] for row in known}
     
     def clear_all_data(self) -> None:
         """
@@ -170,35 +397,27 @@ class MatchDatabase(DuckDBBase):
         This will delete all rows from both the participants and matches tables.
         The tables and indexes will remain intact.
         """
-        # Delete participants first due to foreign key constraint
-        self.con.execute("DELETE FROM participants")
-        self.con.execute("DELETE FROM matches")
+        # No foreign key ties the tables together, so the order doesn't matter; one
+        # transaction keeps a failure from leaving participants without their matches
+        with self.transaction():
+            self.con.execute("DELETE FROM participants")
+            self.con.execute("DELETE FROM matches")
+        self._load_known_match_ids()
 
 
-class QueryProgressTracker(DuckDBBase):
+class QueryProgressTracker:
     """Tracks query progress for match ID fetching by player, platform, and time range."""
     
-    def __init__(self, db_path: str = "data/match_data/query_progress.duckdb"):
+    def __init__(self, db: MatchDatabase):
         """
         Initialize query progress tracker.
         
         Args:
-            db_path: Path to the DuckDB database file (should match MatchDatabase)
+            db: Match database whose connection (and file) the query_progress table
+                lives in, so progress and matches can be committed together
         """
-        super().__init__(db_path)
-    
-    def _init_schema(self):
-        """Create query_progress table if it doesn't exist."""
-        self.con.execute("""CREATE TABLE IF NOT EXISTS query_progress (
-            platform TEXT,
-            start_time TEXT,
-            end_time TEXT,
-            puuid TEXT,
-            last_start_index INTEGER DEFAULT 0,
-            last_updated TIMESTAMP DEFAULT NOW(),
-            PRIMARY KEY (platform, start_time, end_time, puuid)
-        );""")
-        self.con.execute("CREATE INDEX IF NOT EXISTS idx_query_progress_lookup ON query_progress(platform, start_time, end_time, puuid);")
+        self.db = db
+        self.con = db.con
     
     def get_query_start_index(
         self,
@@ -260,6 +479,88 @@ class QueryProgressTracker(DuckDBBase):
             [platform, start_time, end_time, puuid, last_start_index]
         )
     
+    def get_query_start_indices(
+        self,
+        platform: str,
+        start_time: str,
+        end_time: str,
+        puuids: Iterable[str],
+    ) -> dict[str, int]:
+        """
+        Get the start indices for many players with a single query.
+        
+        Args:
+            platform: Platform identifier (e.g., "NA1")
+            start_time: Start time string
+            end_time: End time string
+            puuids: Player UUIDs to look up
+            
+        Returns:
+            Mapping of puuid to start index (0 for players not found)
+        """
+        start_indices = dict.fromkeys(puuids, 0)
+        if not start_indices:
+            return start_indices
+
+        candidates = pd.DataFrame({"puuid": list(start_indices)}, dtype=object)
+        self.con.register("candidate_puuids", candidates)
+        try:
+            result = self.con.execute(
+                """
+                SELECT q.puuid, q.last_start_index
+                FROM query_progress q
+                SEMI JOIN candidate_puuids c USING (puuid)
+                WHERE q.platform = ? AND q.start_time = ? AND q.end_time = ?
+                """,
+                [platform, start_time, end_time]
+            ).fetchall()
+        finally:
+            self.con.unregister("candidate_puuids")
+
+        start_indices.update(result)
+        return start_indices
+
+    def update_start_indices(
+        self,
+        platform: str,
+        start_time: str,
+        end_time: str,
+        last_start_indices: dict[str, int],
+    ) -> None:
+        """
+        Update the last queried start index for many players in one statement.
+        
+        Args:
+            platform: Platform identifier (e.g., "NA1")
+            start_time: Start time string
+            end_time: End time string
+            last_start_indices: Mapping of puuid to the last start index that was queried
+        """
+        if not last_start_indices:
+            return
+
+        progress = pd.DataFrame(
+            {
+                "puuid": list(last_start_indices),
+                "last_start_index": list(last_start_indices.values()),
+            }
+        ).astype({"puuid": object, "last_start_index": "int32"})
+        self.con.register("progress_stage", progress)
+        try:
+            self.con.execute(
+                """
+                INSERT INTO query_progress (platform, start_time, end_time, puuid, last_start_index, last_updated)
+                SELECT ?, ?, ?, puuid, last_start_index, NOW() FROM progress_stage
+                ON CONFLICT (platform, start_time, end_time, puuid) 
+                DO UPDATE SET 
+                    last_start_index = excluded.last_start_index,
+                    last_updated = NOW()
+                """,
+                [platform, start_time, end_time]
+            )
+        finally:
+            self.con.unregister("progress_stage")
+    
     def clear_all_data(self) -> None:
         """
         Remove all data from the database.
@@ -271,18 +572,17 @@ class QueryProgressTracker(DuckDBBase):
 
 
 def _main():
-    """Example usage: clear all data from both databases."""
-    # Clear matches database
+    """Example usage: clear all data from the database."""
     with MatchDatabase("data/match_data/matches.duckdb") as db:
-        print("Clearing all data from matches database...")
+        # Clear matches
+        print("Clearing all match data...")
         db.clear_all_data()
-        print("Matches database cleared successfully!")
-    
-    # Clear query progress database
-    with QueryProgressTracker("data/match_data/query_progress.duckdb") as tracker:
-        print("Clearing all data from query progress database...")
-        tracker.clear_all_data()
-        print("Query progress database cleared successfully!")
+        print("Match data cleared successfully!")
+
+        # Clear query progress
+        print("Clearing all query progress data...")
+        QueryProgressTracker(db).clear_all_data()
+        print("Query progress data cleared successfully!")
 
 
 if __name__ == "__main__":
@@ -4,18 +4,19 @@ import time
 
 from src.utils.util import (
     Rank,
-    PLATFORM_TO_REGION,
+    platform_to_region,
     date_string_to_iso_start_of_day,
     iso_to_timestamp_s,
 )
 from src.utils.logger import log
-from src.data.riot_api import RiotAPI, Match, League
+from src.data.riot_api import AsyncRiotAPI, Match, League
 from src.data.duckdb import MatchDatabase, QueryProgressTracker
+from src.data.response_cache import ResponseCache
 
-
-match_database = MatchDatabase()
-query_progress_tracker = QueryProgressTracker()
-api = RiotAPI()
+# Ranks whose league is a single list rather than paged entries
+_MASTERPLUS_RANKS = frozenset({Rank.CHALLENGER, Rank.GRANDMASTER, Rank.MASTER})
+# Largest `count` match-v5 accepts for a player's match IDs; anything above is a 400
+_MAX_MATCH_IDS_PER_REQUEST = 100
 
 
 def query_matches(
@@ -24,125 +25,224 @@ def query_matches(
     start_time: str,
     end_time: str,
     target_matches: int,
+):
+    # Open the database per run rather than at import time; the same connection is
+    # handed to every gather_matches call so the match-id cache is loaded only once
+    # League pages are cached on disk so a re-run does not re-download the same players
+    with MatchDatabase(bulk_mode=True) as match_database, ResponseCache() as response_cache:
+        query_progress_tracker = QueryProgressTracker(match_database)
+        return asyncio.run(_query_matches(
+            platform,
+            rank,
+            start_time,
+            end_time,
+            target_matches,
+            match_database,
+            query_progress_tracker,
+            response_cache,
+        ))
+
+
+async def _query_matches(
+    platform: str,
+    rank: Rank,
+    start_time: str,
+    end_time: str,
+    target_matches: int,
+    match_database: MatchDatabase,
+    query_progress_tracker: QueryProgressTracker,
+    response_cache: ResponseCache | None = None,
 ):
     processed_matches = 0
     iterations = 0
     rank_page_start_index = 1
+    # Players whose match history in the time range ran out; skipped on later iterations
+    exhausted_players: set[str] = set()
+    # Master+ leagues are a single list that does not change during a run
+    masterplus_league: League | None = None
+    # Below master, the next league page is fetched in the background while the
+    # current players' matches are gathered
+    next_page: asyncio.Task | None = None
 
     MAX_PAGE_INDEX = 50  # random index, just in case overflow (unlucky though)
     MAX_ITERATIONS = 10  # random iterations, just in case overflow (unlucky though)
-    while processed_matches < target_matches and iterations < MAX_ITERATIONS:
-        needed_matches = target_matches - processed_matches
-        num_players = needed_matches // 2  # we query 2 matches per player
-        if rank in [Rank.CHALLENGER, Rank.GRANDMASTER, Rank.MASTER]:
-            league = api.get_league(platform=platform, rank=rank)
-            if iterations % 2:
-                players = league.players[: min(num_players, len(league.players))]
-            else:
-                players = league.players[max(0, len(league.players) - num_players) :]
-        else:
-            players = []
-            pages_visited = 0
-            while len(players) < num_players and pages_visited < MAX_PAGE_INDEX:
-                league = api.get_league(platform=platform, rank=rank, page=rank_page_start_index)
-                if not league.players:  # No more players on this page, stop
+    # One API client (and its keep-alive connection pool) for the whole run
+    async with AsyncRiotAPI(cache=response_cache) as api:
+        # Resolve and connect to both hosts once up front; otherwise the first burst of
+        # concurrent requests each starts its own DNS lookup and handshake
+        await api.warmup(platforms=[platform], regions=[platform_to_region(platform)])
+
+        def prefetch_page(page: int) -> asyncio.Task:
+            return asyncio.create_task(api.get_league(platform=platform, rank=rank, page=page))
+
+        try:
+            while processed_matches < target_matches and iterations < MAX_ITERATIONS:
+                needed_matches = target_matches - processed_matches
+                # we query 2 matches per player
+                num_players = max(needed_matches // 2, 1)
+                if rank in _MASTERPLUS_RANKS:
+                    if masterplus_league is None:
+                        masterplus_league = await api.get_league(platform=platform, rank=rank)
+                    candidates = [p for p in masterplus_league.players if p not in exhausted_players]
+                    if iterations % 2:
+                        players = candidates[: min(num_players, len(candidates))]
+                    else:
+                        players = candidates[max(0, len(candidates) - num_players) :]
+                else:
+                    players = []
+                    seen_players: set[str] = set()
+                    first_page = rank_page_start_index
+                    pages_visited = 0
+                    while len(players) < num_players and pages_visited < MAX_PAGE_INDEX:
+                        league = await (next_page or prefetch_page(rank_page_start_index))
+                        next_page = None
+                        pages_visited += 1
+                        if league.players:
+                            rank_page_start_index = (rank_page_start_index % MAX_PAGE_INDEX) + 1
+                        else:
+                            # Past the last page: wrap around, since players on earlier pages
+                            # may still have matches left. Only exhaustion ends the run.
+                            rank_page_start_index = 1
+                        next_page = prefetch_page(rank_page_start_index)
+                        for p in league.players:
+                            if p not in exhausted_players and p not in seen_players:
+                                seen_players.add(p)
+                                players.append(p)
+                        if rank_page_start_index == first_page:  # every page seen once
+                            break
+                if not players:  # every reachable player is exhausted
                     break
-                players = players + league.players
-                rank_page_start_index = (rank_page_start_index % MAX_PAGE_INDEX) + 1
-                pages_visited += 1
-        iterations += 1
-        processed_matches += gather_matches(
-            platform, start_time, end_time, needed_matches, players, rank
-        )
+                iterations += 1
+                processed_matches += await gather_matches(
+                    platform,
+                    start_time,
+                    end_time,
+                    needed_matches,
+                    players,
+                    rank,
+                    match_database,
+                    query_progress_tracker,
+                    api,
+                    exhausted_players,
+                )
+        finally:
+            if next_page is not None:
+                next_page.cancel()
     return processed_matches
 
 
 # TODO: rate limiting logic
 
 
-def gather_matches(
+async def gather_matches(
     platform: str,
     start_time: str,
     end_time: str,
     target_num_matches: int,
     players: list[str],
     rank: Rank,
+    match_database: MatchDatabase,
+    query_progress_tracker: QueryProgressTracker,
+    api: AsyncRiotAPI,
+    exhausted_players: set[str] | None = None,
 ) -> int:
+    """
+    Fetch new matches for the given players and insert them into the database.
+
+    Each player is asked for an equal share of target_num_matches. Players that return
+    fewer match IDs than requested have no more matches in the time range and are added
+    to exhausted_players (when given) so callers can stop querying them.
+    """
+    if not players:
+        return 0
+
     match_ids: set[str] = set()
+    matches: list[Match] = []
 
-    matches_per_player = max(math.ceil(target_num_matches / len(players)), 2)
-    # batch_size_match_ids_by_puuid = int(200 * 0.1) # 200 req / s * 0.1 s = 60 batch_size
-    # rough estimate, estimate towards smaller flight time
-    batch_size_match_ids_by_puuid = 1
+    matches_per_player = min(
+        max(math.ceil(target_num_matches / len(players)), 2), _MAX_MATCH_IDS_PER_REQUEST
+    )
+    # Concurrency is bounded by a semaphore / worker count (and the shared rate limiter)
+    # rather than by awaiting fixed-size batches one after another
+    match_ids_semaphore_size = 60
+    match_details_workers = 60
+
+    # Load every player's progress up front and write it back once all players finish
+    start_indices = query_progress_tracker.get_query_start_indices(
+        platform, start_time, end_time, players
+    )
+    new_start_indices: dict[str, int] = {}
+    # Convert ISO strings to Unix timestamps in seconds for the API, once for all players
+    start_time_s = iso_to_timestamp_s(start_time)
+    end_time_s = iso_to_timestamp_s(end_time)
+    region = platform_to_region(platform)
 
-    async def fetch_for_player(puuid: str) -> None:
+    async def fetch_for_player(
+        semaphore: asyncio.Semaphore,
+        queue: asyncio.Queue,
+        puuid: str,
+    ) -> None:
+        """Producer: fetch a player's match IDs and queue the ones not seen before."""
         try:
-            start_index = query_progress_tracker.get_query_start_index(
-                platform, start_time, end_time, puuid
-            )
-            # Convert ISO strings to Unix timestamps in seconds for the API
-            start_time_s = iso_to_timestamp_s(start_time)
-            end_time_s = iso_to_timestamp_s(end_time)
-            ids = await asyncio.to_thread(
-                api.get_match_ids_by_puuid,
-                puuid,
-                region=PLATFORM_TO_REGION[platform],
-                start_time=start_time_s,
-                end_time=end_time_s,
-                start=start_index,
-                count=matches_per_player,
-            )
-            query_progress_tracker.update_start_index(
-                platform, start_time, end_time, puuid, start_index + len(ids)
-            )
-            if ids:
-                match_ids.update(ids)
+            start_index = start_indices[puuid]
+            async with semaphore:
+                ids = await api.get_match_ids_by_puuid(
+                    puuid,
+                    region=region,
+                    start_time=start_time_s,
+                    end_time=end_time_s,
+                    start=start_index,
+                    count=matches_per_player,
+                )
+            new_start_indices[puuid] = start_index + len(ids)
+            if len(ids) < matches_per_player and exhausted_players is not None:
+                exhausted_players.add(puuid)
+            for match_id in match_database.get_only_new_match_ids(set(ids) - match_ids):
+                queue.put_nowait(match_id)
+            match_ids.update(ids)
             log(f"Fetched {len(ids)} match IDs for player {puuid}")
         except Exception as e:
             log(f"Error fetching match IDs for player {puuid}: {e}")
 
-    async def fetch_all() -> None:
-        for i in range(0, len(players), batch_size_match_ids_by_puuid):
-            batch = players[i : i + batch_size_match_ids_by_puuid]
-            tasks = [asyncio.create_task(fetch_for_player(puuid)) for puuid in batch]
-            await asyncio.gather(*tasks, return_exceptions=False)
-
-    # Fetch all match IDs from players
-    asyncio.run(fetch_all())
-
-    new_match_ids = match_database.get_only_new_match_ids(match_ids)
-
-    # Fetch match details for each new match ID
-    matches: list[Match] = []
+    async def fetch_match_details(
+        queue: asyncio.Queue,
+    ) -> None:
+        """Consumer: fetch match details for queued match IDs until a None sentinel."""
+        while (match_id := await queue.get()) is not None:
+            try:
+                match_data = await api.get_match(match_id, region=region)
+                if match_data:
+                    match_obj = Match.from_json(match_data)
+                    match_obj.set_rank(rank)
+                    matches.append(match_obj)
+                log(f"Fetched match details for match {match_id}")
+            except Exception as e:
+                log(f"Error fetching match details for match {match_id}: {e}")
 
-    # batch_size_match_details = int(200 * 0.1) # 200 req / s * 0.1 s = 60 batch_size
-    # rough estimate, estimate towards smaller flight time
-    batch_size_match_details = 1
-
-    async def fetch_match_details(match_id: str) -> None:
-        try:
-            match_data = await asyncio.to_thread(
-                api.get_match, match_id, region=PLATFORM_TO_REGION[platform]
-            )
-            if match_data:
-                match_obj = Match.from_json(match_data)
-                match_obj.set_rank(rank)
-                matches.append(match_obj)
-            log(f"Fetched match details for match {match_id}")
-        except Exception as e:
-            log(f"Error fetching match details for match {match_id}: {e}")
-
-    async def fetch_all_matches() -> None:
-        for i in range(0, len(new_match_ids), batch_size_match_details):
-            batch = list(new_match_ids)[i : i + batch_size_match_details]
-            tasks = [asyncio.create_task(fetch_match_details(match_id)) for match_id in batch]
-            await asyncio.gather(*tasks, return_exceptions=False)
+    async def fetch_all() -> None:
+        # Match details are fetched as soon as their IDs arrive instead of after every
+        # player's IDs have been collected
+        queue: asyncio.Queue = asyncio.Queue()
+        semaphore = asyncio.Semaphore(match_ids_semaphore_size)
+        consumers = [
+            asyncio.create_task(fetch_match_details(queue))
+            for _ in range(match_details_workers)
+        ]
+        await asyncio.gather(
+            *(fetch_for_player(semaphore, queue, puuid) for puuid in players)
+        )
+        for _ in consumers:
+            queue.put_nowait(None)
+        await asyncio.gather(*consumers)
 
-    # Fetch all match details
-    asyncio.run(fetch_all_matches())
+    await fetch_all()
 
-    # Insert match details into database
-    sucsessful_inserts = match_database.upsert_many(matches)
+    # Insert match details and record query progress atomically
+    with match_database.transaction():
+        sucsessful_inserts = match_database.upsert_many(matches)
+        query_progress_tracker.update_start_indices(
+            platform, start_time, end_time, new_start_indices
+        )
 
     return sucsessful_inserts
 
@@ -150,7 +250,6 @@ def gather_matches(
 if __name__ == "__main__":
     platform = "NA1"
     rank = Rank.GRANDMASTER
-    api = RiotAPI()
     start_time = date_string_to_iso_start_of_day("2025-11-01")
     end_time = date_string_to_iso_start_of_day("2025-11-04")
     target_num_matches = 1000
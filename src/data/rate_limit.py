@@ -0,0 +1,174 @@
+"""Client-side rate limiter that follows Riot's application and method rate limits.
+
+Riot enforces several windows at once (e.g. 20 requests / 1s AND 100 requests / 120s),
+both for the whole API key ("application", per routing host) and per endpoint
+("method"). Every response reports the active limits and current counts in headers:
+
+    X-App-Rate-Limit: 20:1,100:120           X-App-Rate-Limit-Count: 3:1,17:120
+    X-Method-Rate-Limit: 2000:10             X-Method-Rate-Limit-Count: 3:10
+
+and a 429 carries Retry-After (seconds) plus X-Rate-Limit-Type saying which limit
+was hit. RiotRateLimiter keeps a sliding window per (scope, key) pair, learns the
+real limits from those headers, and blocks a scope for Retry-After on a 429.
+"""
+
+import asyncio
+import bisect
+import threading
+import time
+from collections.abc import Mapping
+
+# Development key limits, used for the application scope until Riot reports its own
+DEFAULT_APP_RATE_LIMIT = "20:1,100:120"
+
+
+def parse_rate_limit(header: str) -> list[tuple[int, int]]:
+    """Parse a Riot rate limit header such as "20:1,100:120" into (count, seconds) pairs."""
+    windows = []
+    for part in header.split(","):
+        count, _, seconds = part.strip().partition(":")
+        if not count or not seconds:
+            raise ValueError(f"Malformed rate limit header: {header!r}")
+        windows.append((int(count), int(seconds)))
+    return windows
+
+
+class _Window:
+    """Sliding window holding the send times of recent requests."""
+
+    __slots__ = ("limit", "seconds", "hits")
+
+    def __init__(self, limit: int, seconds: int, hits: list[float] | None = None) -> None:
+        self.limit = limit
+        self.seconds = seconds
+        self.hits = hits if hits is not None else []
+
+    def prune(self, now: float) -> None:
+        cutoff = now - self.seconds
+        del self.hits[: bisect.bisect_right(self.hits, cutoff)]
+
+    def next_slot(self, now: float) -> float:
+        """Earliest time at which one more request fits in this window."""
+        self.prune(now)
+        if len(self.hits) < self.limit:
+            return now
+        return self.hits[len(self.hits) - self.limit] + self.seconds
+
+
+class RiotRateLimiter:
+    """Thread-safe limiter for Riot's application and method rate limit windows."""
+
+    def __init__(self, app_rate_limit: str = DEFAULT_APP_RATE_LIMIT) -> None:
+        """
+        Args:
+            app_rate_limit: Application limits to assume before any response has been
+                seen, in Riot header format
+        """
+        self._default_app_limits = parse_rate_limit(app_rate_limit)
+        self._windows: dict[tuple[str, str], list[_Window]] = {}
+        self._blocked_until: dict[tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, host: str, method: str, now: float | None = None) -> float:
+        """
+        Reserve a slot for one request and return how long to wait before sending it.
+
+        Args:
+            host: Routing host the request goes to (application limits are per host)
+            method: Endpoint identifier (method limits are per endpoint and host)
+            now: Current time.monotonic() value; only overridden in tests
+        """
+        if now is None:
+            now = time.monotonic()
+        keys = self._keys(host, method)
+        with self._lock:
+            send_at = now
+            for key in keys:
+                send_at = max(send_at, self._blocked_until.get(key, now))
+                for window in self._windows_for(key):
+                    send_at = max(send_at, window.next_slot(now))
+            for key in keys:
+                for window in self._windows_for(key):
+                    bisect.insort(window.hits, send_at)
+        return send_at - now
+
+    def acquire(self, host: str, method: str) -> None:
+        """Block the calling thread until a request to this endpoint may be sent."""
+        delay = self.reserve(host, method)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, host: str, method: str) -> None:
+        """Wait (without blocking the event loop) until a request may be sent."""
+        delay = self.reserve(host, method)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def record_response(
+        self,
+        host: str,
+        method: str,
+        status_code: int,
+        headers: Mapping[str, str],
+        now: float | None = None,
+    ) -> None:
+        """
+        Update limits and counts from a response's rate limit headers.
+
+        On a 429 the scope named by X-Rate-Limit-Type (the method when absent) is
+        blocked for Retry-After seconds.
+        """
+        if now is None:
+            now = time.monotonic()
+        app_key, method_key = self._keys(host, method)
+        with self._lock:
+            self._apply_headers(app_key, headers.get("X-App-Rate-Limit"),
+                                headers.get("X-App-Rate-Limit-Count"), now)
+            self._apply_headers(method_key, headers.get("X-Method-Rate-Limit"),
+                                headers.get("X-Method-Rate-Limit-Count"), now)
+            if status_code == 429:
+                retry_after = float(headers.get("Retry-After", 1))
+                limited = app_key if headers.get("X-Rate-Limit-Type") == "application" else method_key
+                self._blocked_until[limited] = max(
+                    self._blocked_until.get(limited, now), now + retry_after
+                )
+
+    @staticmethod
+    def _keys(host: str, method: str) -> tuple[tuple[str, str], tuple[str, str]]:
+        return ("application", host), ("method", f"{host}{method}")
+
+    def _windows_for(self, key: tuple[str, str]) -> list[_Window]:
+        windows = self._windows.get(key)
+        if windows is None:
+            limits = self._default_app_limits if key[0] == "application" else []
+            windows = [_Window(limit, seconds) for limit, seconds in limits]
+            self._windows[key] = windows
+        return windows
+
+    def _apply_headers(
+        self,
+        key: tuple[str, str],
+        limit_header: str | None,
+        count_header: str | None,
+        now: float,
+    ) -> None:
+        if limit_header:
+            limits = parse_rate_limit(limit_header)
+            current = {window.seconds: window for window in self._windows_for(key)}
+            windows = []
+            for limit, seconds in limits:
+                existing = current.get(seconds)
+                windows.append(_Window(limit, seconds, existing.hits if existing else None))
+            self._windows[key] = windows
+
+        if count_header:
+            windows_by_seconds = {window.seconds: window for window in self._windows_for(key)}
+            for count, seconds in parse_rate_limit(count_header):
+                window = windows_by_seconds.get(seconds)
+                if window is None:
+                    continue
+                window.prune(now)
+                # Riot saw more requests than we tracked (other processes on the same key)
+                missing = count - len(window.hits)
+                for _ in range(missing):
+                    bisect.insort(window.hits, now)
@@ -0,0 +1,104 @@
+"""Persistent SQLite cache for Riot API response bodies, keyed on the request url."""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+from urllib.parse import urlencode
+
+
+class ResponseCache:
+    """
+    Stores raw response bodies on disk so re-runs do not spend rate limit budget on
+    data that has not changed.
+
+    Safe to share between threads and with an asyncio client; each lookup is a single
+    indexed SQLite read. Expired entries are kept along with their ETag so the client
+    can revalidate them with If-None-Match instead of downloading the body again.
+    """
+
+    def __init__(self, db_path: str = "data/match_data/riot_cache.sqlite") -> None:
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._con = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute("PRAGMA synchronous=NORMAL")
+        self._con.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                expires_at REAL,
+                etag TEXT
+            )
+        """)
+        # Cache files created before ETags were stored lack the column
+        columns = {row[1] for row in self._con.execute("PRAGMA table_info(responses)")}
+        if "etag" not in columns:
+            self._con.execute("ALTER TABLE responses ADD COLUMN etag TEXT")
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url: str, params: dict[str, Any] | None = None) -> str:
+        """Cache key for a request; params are sorted so their order does not matter."""
+        if not params:
+            return url
+        return f"{url}?{urlencode(sorted(params.items()))}"
+
+    def get(self, key: str) -> bytes | None:
+        """Return the cached body for key, or None when missing or expired."""
+        with self._lock:
+            row = self._con.execute(
+                "SELECT body, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        body, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            return None
+        return body
+
+    def get_revalidatable(self, key: str) -> tuple[str, bytes] | None:
+        """Return (etag, body) for an entry stored with an ETag, whether expired or not."""
+        with self._lock:
+            row = self._con.execute(
+                "SELECT etag, body FROM responses WHERE key = ? AND etag IS NOT NULL", (key,)
+            ).fetchone()
+        return row
+
+    def set(
+        self,
+        key: str,
+        body: bytes,
+        ttl: float | None = None,
+        etag: str | None = None,
+    ) -> None:
+        """Store body under key; ttl is in seconds, None keeps it forever."""
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._con.execute(
+                "INSERT OR REPLACE INTO responses (key, body, expires_at, etag) VALUES (?, ?, ?, ?)",
+                (key, body, expires_at, etag),
+            )
+
+    def refresh(self, key: str, ttl: float | None = None) -> None:
+        """Extend an entry's expiry, e.g. after the server answered 304 Not Modified."""
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._con.execute(
+                "UPDATE responses SET expires_at = ? WHERE key = ?", (expires_at, key)
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._con.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        with self._lock:
+            self._con.close()
+
+    def __enter__(self) -> "ResponseCache":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -1,16 +1,24 @@
 """Minimal Riot API wrapper for the endpoints used in this project."""
 
+import asyncio
 import os
-from collections.abc import Iterable, Sequence
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Sequence
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
-from urllib.parse import quote
-from pyrate_limiter import Limiter, RequestRate, Duration
+from urllib.parse import quote, urlsplit
 
-import requests
+import httpx
+import orjson
 from dotenv import load_dotenv
 
-from src.utils.util import Rank
+from src.data.rate_limit import RiotRateLimiter
+from src.data.response_cache import ResponseCache
+from src.utils.util import PLATFORM_TO_REGION, Rank
 from src.utils.logger import log
 
 load_dotenv()
@@ -23,14 +31,40 @@ DEFAULT_HEADERS = {
         "Chrome/137.0.0.0 Safari/537.36"
     ),
     "Accept-Language": "en-US,en;q=0.9",
+    # Match JSON compresses several times over; both HTTP clients decode gzip natively
+    "Accept-Encoding": "gzip, deflate",
     "Accept-Charset": "application/x-www-form-urlencoded; charset=UTF-8",
     "Origin": "https://developer.riotgames.com",
 }
 
-match_v5_rate = RequestRate(200, Duration.SECOND)
-limiter = Limiter(match_v5_rate)
-
-global_limiter = Limiter(RequestRate(50, Duration.MINUTE))
+# Shared by every client in the process, since Riot counts requests per API key
+rate_limiter = RiotRateLimiter()
+
+# How many times a request is retried after a 429 or a transient server error
+MAX_RETRIES = 3
+# Server errors are retried with exponential backoff starting at RETRY_BACKOFF_S
+RETRY_BACKOFF_S = 0.5
+_RETRY_STATUSES = frozenset({500, 502, 503, 504})
+# Idle pooled connections are kept this long (httpx defaults to 5 s), so pauses between
+# crawl iterations do not cost a fresh DNS lookup + TCP/TLS handshake per host
+KEEPALIVE_EXPIRY_S = 60.0
+
+# Fixed path segments of the endpoints we call; anything else in a path is a parameter
+_ROUTE_SEGMENTS = frozenset({
+    "lol", "league", "v4", "entries", "challengerleagues", "grandmasterleagues",
+    "masterleagues", "by-queue", "match", "v5", "matches", "by-puuid", "ids",
+})
+
+# How long responses are kept in a ResponseCache, per endpoint (None = forever).
+# Endpoints not listed are never cached: match ids grow as players play, and full match
+# bodies already end up in the match database (the crawl skips stored ids before fetching
+# them), so caching them would only duplicate that data on disk with nothing to evict it.
+_CACHE_TTLS: dict[str, float | None] = {
+    "/lol/league/v4/entries/{}/{}/{}": 3600,
+    "/lol/league/v4/challengerleagues/by-queue/{}": 3600,
+    "/lol/league/v4/grandmasterleagues/by-queue/{}": 3600,
+    "/lol/league/v4/masterleagues/by-queue/{}": 3600,
+}
 
 def _required(container: dict[str, Any], key: str, context: str) -> Any:
     """Fetch a required key from a mapping, raising ValueError when absent or falsy."""
@@ -43,7 +77,17 @@ def _required(container: dict[str, Any], key: str, context: str) -> Any:
     return value
 
 
-@dataclass
+def _intern(value: Any) -> Any:
+    """
+    Intern string values so repeated ones share a single object.
+
+    The same PUUIDs show up across many matches and league pages, and champion and
+    position names come from small fixed sets, so a crawl holds far fewer strings.
+    """
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@dataclass(slots=True)
 class MatchParticipant:
     """Represents an individual participant within a match."""
 
@@ -82,10 +126,10 @@ class MatchParticipant:
             win_val = None
         try:
             return cls(
-                puuid=puuid,
-                champion=champion_name,
-                individual_position=payload["individualPosition"],
-                team_position=payload["teamPosition"],
+                puuid=_intern(puuid),
+                champion=_intern(champion_name),
+                individual_position=_intern(payload["individualPosition"]),
+                team_position=_intern(payload["teamPosition"]),
                 team_id=payload["teamId"],
                 win=win_val,
                 rank_num=None,
@@ -94,7 +138,7 @@ class MatchParticipant:
             raise ValueError("MatchParticipant missing fields", e)
 
 
-@dataclass
+@dataclass(slots=True)
 class Match:
     """Represents a match and relevant metadata."""
 
@@ -138,10 +182,11 @@ class Match:
                 game_creation=info["gameCreation"],
                 game_duration=info["gameDuration"],
                 game_end_timestamp=info["gameEndTimestamp"],
-                game_mode=info["gameMode"],
+                # Mode, type and patch repeat across every match in a crawl
+                game_mode=_intern(info["gameMode"]),
                 game_start_timestamp=info["gameStartTimestamp"],
-                game_type=info["gameType"],
-                game_version=info["gameVersion"],
+                game_type=_intern(info["gameType"]),
+                game_version=_intern(info["gameVersion"]),
                 participants=participants,
             )
         except KeyError as e:
@@ -155,7 +200,7 @@ class Match:
             participant.rank_num = rank
 
 
-@dataclass
+@dataclass(slots=True)
 class League:
     """Subset of a ranked league with the players' PUUIDs."""
 
@@ -172,7 +217,15 @@ class League:
         if not isinstance(entries_raw, (list, tuple)):
             raise ValueError("league field 'entries' must be a list")
 
-        players: list[str] = []
+        # Fast path for well-formed payloads; the loop below only runs to report errors
+        try:
+            players = [_intern(entry["puuid"]) for entry in entries_raw]
+            if all(players):
+                return cls(players=players, tier=tier, rank=None)
+        except (KeyError, TypeError):
+            pass
+
+        players = []
         for index, entry in enumerate(entries_raw):
             if not isinstance(entry, dict):
                 raise ValueError(f"league entries[{index}] must be an object")
@@ -182,7 +235,7 @@ class League:
                 raise ValueError(f"league entries[{index}] missing required field 'puuid'") from exc
             if not puuid:
                 raise ValueError(f"league entries[{index}] field 'puuid' is empty")
-            players.append(puuid)
+            players.append(_intern(puuid))
 
         return cls(players=players, tier=tier, rank=None)
 
@@ -194,10 +247,19 @@ class League:
         if not payload:
             raise ValueError("below-master league payload is empty")
 
-        players: list[str] = []
         tier = _required(payload[0], "tier", "entries[0]")
         rank = _required(payload[0], "rank", "entries[0]")
 
+        # Fast path for well-formed payloads; the loop below only runs to report errors
+        try:
+            if all(entry["tier"] == tier and entry["rank"] == rank for entry in payload):
+                players = [_intern(entry["puuid"]) for entry in payload]
+                if all(players):
+                    return cls(players=players, tier=tier, rank=rank)
+        except (KeyError, TypeError):
+            pass
+
+        players: list[str] = []
         for index, entry in enumerate(payload):
             if not isinstance(entry, dict):
                 raise ValueError(f"entries[{index}] must be an object")
@@ -211,7 +273,7 @@ class League:
                 raise ValueError(f"entries[{index}] rank '{entry_rank}' does not match '{rank}'")
 
             puuid = _required(entry, "puuid", f"entries[{index}]")
-            players.append(puuid)
+            players.append(_intern(puuid))
 
         return cls(players=players, tier=tier, rank=rank)
 
@@ -226,15 +288,44 @@ class RiotAPIError(RuntimeError):
         self.payload = payload
 
 
-class RiotAPI:
-    """Very small helper for the needed Riot endpoints."""
+def _host_table(routes: Iterable[str]) -> dict[str, str]:
+    """Map each routing value (as given and lowercased) to its API base url."""
+    hosts = {}
+    for route in routes:
+        host = f"https://{route.lower()}.api.riotgames.com"
+        hosts[route] = hosts[route.lower()] = host
+    return hosts
+
+
+# Base urls are looked up on every request, so build them once for all known routes
+_PLATFORM_HOSTS = _host_table(PLATFORM_TO_REGION)
+_REGION_HOSTS = _host_table(set(PLATFORM_TO_REGION.values()))
+
+
+def _route_host(hosts: dict[str, str], route: str) -> str:
+    """Look up a routing value's base url, adding routes missing from the table on first use."""
+    host = hosts.get(route)
+    if host is None:
+        host = hosts[route] = f"https://{route.lower()}.api.riotgames.com"
+    return host
+
+
+_MASTERPLUS_LEAGUE_PATHS = {
+    Rank.CHALLENGER: "challengerleagues",
+    Rank.GRANDMASTER: "grandmasterleagues",
+    Rank.MASTER: "masterleagues",
+}
+
+
+class _RiotAPIBase:
+    """Request building and response handling shared by the sync and async clients."""
 
     def __init__(
         self,
         api_key: str | None = None,
         *,
         timeout: int = 10,
-        session: requests.Session | None = None,
+        cache: ResponseCache | None = None,
     ) -> None:
         token = api_key or os.getenv("RIOT_API_KEY")
         if not token:
@@ -242,7 +333,255 @@ class RiotAPI:
 
         self._token = token
         self._timeout = timeout
-        self._session = session or requests.Session()
+        # Headers never change for a client, so build them once
+        self._request_headers = {**DEFAULT_HEADERS, "X-Riot-Token": token}
+        self._cache = cache
+
+    def _league_entries_url(
+        self,
+        queue: str,
+        tier: str,
+        division: str,
+        platform: str,
+    ) -> str:
+        return f"{self._platform_host(platform)}/lol/league/v4/entries/{queue}/{tier}/{division}"
+
+    def _match_ids_url(
+        self,
+        puuid: str,
+        *,
+        region: str,
+        start_time: int | None,
+        end_time: int | None,
+        queue: int | None,
+        match_type: str | None,
+        start: int | None,
+        count: int | None,
+    ) -> str:
+        """Build the url, including its query string, for the match ids by PUUID endpoint."""
+        # Riot API requires quotes around PUUID in the path, URL-encode the quotes
+        encoded_puuid = quote(f'"{puuid}"')
+        url = f"{self._region_host(region)}/lol/match/v5/matches/by-puuid/{encoded_puuid}/ids"
+        # The parameter names are fixed, so the query string is formatted directly
+        # instead of going through a params dict and urlencode on every request
+        query = []
+        if start_time is not None:
+            query.append(f"startTime={start_time}")
+        if end_time is not None:
+            query.append(f"endTime={end_time}")
+        if queue is not None:
+            query.append(f"queue={queue}")
+        if match_type is not None:
+            query.append(f"type={quote(match_type)}")
+        if start is not None:
+            query.append(f"start={start}")
+        if count is not None:
+            query.append(f"count={count}")
+        return f"{url}?{'&'.join(query)}" if query else url
+
+    def _match_url(self, match_id: str, region: str) -> str:
+        return f"{self._region_host(region)}/lol/match/v5/matches/{match_id}"
+
+    def _masterplus_league_url(self, rank: Rank, queue: str, platform: str) -> str:
+        try:
+            path = _MASTERPLUS_LEAGUE_PATHS[rank]
+        except KeyError as exc:
+            raise ValueError(f"Unsupported rank: {rank}") from exc
+        return f"{self._platform_host(platform)}/lol/league/v4/{path}/by-queue/{queue}"
+
+    def _league_request(
+        self,
+        platform: str,
+        rank: Rank,
+        queue: str,
+        page: int | None,
+    ) -> tuple[str, dict[str, Any] | None, Callable[[Any], League]]:
+        """Build the url, query params and payload parser for get_league."""
+        from src.utils.util import rank_enum_to_tier_rank
+
+        # Handle master+ ranks (Master, Grandmaster, Challenger)
+        if rank in _MASTERPLUS_LEAGUE_PATHS:
+            url = self._masterplus_league_url(rank, queue, platform)
+            return url, None, League.from_masterplus_json
+
+        # Handle below-master ranks (need tier and division)
+        tier, division = rank_enum_to_tier_rank(rank)
+        # Convert tier to API format (uppercase first letter, rest lowercase)
+        tier_api = tier.capitalize()
+        # Convert division to API format (uppercase)
+        division_api = division.upper() if division else None
+        
+        if division_api is None:
+            raise ValueError(f"Rank {rank} requires a division")
+
+        url = self._league_entries_url(queue, tier_api, division_api, platform)
+        params = {"page": page} if page is not None else None
+
+        def parse(entries: Iterable[dict[str, Any]]) -> League:
+            # league entries come back as an iterable, convert to list
+            entries_list = list(entries)
+            if not entries_list:
+                # Paging past the last page returns []; report an empty league, not an error
+                return League(players=[], tier=tier.upper(), rank=division_api)
+            return League.from_belowmaster_json(entries_list)
+
+        return url, params, parse
+
+    @staticmethod
+    def _platform_host(platform: str) -> str:
+        # BR1, EUN1, EUW1, JP1, KR, LA1, LA2, ME1, NA1, OC1, RU, SG2, TR1, TW2, VN2
+        # Use these platform routing values for everything other than match endpoints (i.e., league).
+        return _route_host(_PLATFORM_HOSTS, platform)
+
+    @staticmethod
+    def _region_host(region: str) -> str:
+        # There is americas (NA, BR, LAN and LAS), asia (KR, JP), sea (OCE, SG2, TW2 and VN2), europe (EUNE, EUW, ME1, TR and RU)
+        # ONLY for matches API.
+        return _route_host(_REGION_HOSTS, region)
+
+    def _warmup_urls(self, platforms: Iterable[str], regions: Iterable[str]) -> list[str]:
+        return [self._platform_host(p) + "/" for p in platforms] + [
+            self._region_host(r) + "/" for r in regions
+        ]
+
+    def _cache_lookup(
+        self,
+        url: str,
+        params: dict[str, Any] | None,
+        method: str,
+    ) -> tuple[str | None, bytes | None, tuple[str, bytes] | None]:
+        """
+        Return (cache key, fresh cached body, (etag, stale body)).
+
+        The key is None when the request is not cacheable. The etag pair is only set
+        when there is no fresh body but an expired one can be revalidated.
+        """
+        if self._cache is None or method not in _CACHE_TTLS:
+            return None, None, None
+        key = ResponseCache.key(url, params)
+        body = self._cache.get(key)
+        if body is not None:
+            return key, body, None
+        return key, None, self._cache.get_revalidatable(key)
+
+    def _handle_response(
+        self,
+        url: str,
+        method: str,
+        response: httpx.Response,
+        cache_key: str | None,
+        stale: tuple[str, bytes] | None,
+    ) -> Any:
+        """Raise for failed responses, otherwise update the cache and return the payload."""
+        if response.status_code == 304 and stale is not None:
+            # Not modified: keep serving the cached body for another TTL
+            self._cache.refresh(cache_key, _CACHE_TTLS[method])
+            return self._safe_json_bytes(stale[1])
+        if not response.is_success:
+            raise RiotAPIError(
+                url=url,
+                status_code=response.status_code,
+                payload=self._safe_json_bytes(response.content),
+            )
+        if cache_key is not None:
+            self._cache.set(
+                cache_key, response.content, _CACHE_TTLS[method], response.headers.get("ETag")
+            )
+        return self._safe_json_bytes(response.content)
+
+    @staticmethod
+    def _retry_delay(status: int, attempt: int) -> float | None:
+        """Seconds to wait before retrying a response, or None when it should not be retried."""
+        if attempt >= MAX_RETRIES:
+            return None
+        if status == 429:
+            return 0.0  # the rate limiter already holds the next request back for Retry-After
+        if status in _RETRY_STATUSES:
+            return RETRY_BACKOFF_S * 2 ** attempt
+        return None
+
+    @staticmethod
+    def _rate_limit_key(url: str) -> tuple[str, str]:
+        """Split a request url into the (host, method) pair its rate limits apply to."""
+        parts = urlsplit(url)
+        method = "/" + "/".join(
+            segment if segment in _ROUTE_SEGMENTS else "{}"
+            for segment in parts.path.strip("/").split("/")
+        )
+        return parts.netloc, method
+
+    @staticmethod
+    def _safe_json_bytes(body: bytes) -> Any:
+        # orjson parses the large match payloads several times faster than stdlib json
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return body.decode("utf-8", errors="replace")
+
+
+class RiotAPI(_RiotAPIBase):
+    """Very small helper for the needed Riot endpoints."""
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        *,
+        timeout: int = 10,
+        session: httpx.Client | None = None,
+        match_cache_size: int = 1024,
+        cache: ResponseCache | None = None,
+    ) -> None:
+        super().__init__(api_key, timeout=timeout, cache=cache)
+        if session is None:
+            session = self._build_client(timeout)
+        self._session = session
+        # Finished matches never change, and players in the same lobby share match ids,
+        # so match payloads are kept in a small LRU keyed on (region, match_id)
+        self._match_cache: OrderedDict[tuple[str, str], dict[str, Any]] = OrderedDict()
+        self._match_cache_size = match_cache_size
+        self._match_cache_lock = threading.Lock()  # get_matches_bulk calls in from threads
+
+    @staticmethod
+    def _build_client(timeout: int) -> httpx.Client:
+        """
+        Keep-alive HTTP/2 client: concurrent requests (e.g. from get_matches_bulk) to a
+        host are multiplexed over one TLS connection instead of each opening their own.
+        Status-based retries are handled in _get; the transport only retries failed connects.
+        """
+        limits = httpx.Limits(
+            max_connections=64,
+            max_keepalive_connections=32,
+            keepalive_expiry=KEEPALIVE_EXPIRY_S,
+        )
+        return httpx.Client(
+            http2=True,
+            timeout=timeout,
+            limits=limits,
+            transport=httpx.HTTPTransport(http2=True, limits=limits, retries=2),
+        )
+
+    def close(self) -> None:
+        """Close the underlying HTTP client and its connections."""
+        self._session.close()
+
+    def __enter__(self) -> "RiotAPI":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def warmup(self, *, platforms: Iterable[str] = (), regions: Iterable[str] = ()) -> None:
+        """
+        Open a pooled connection (TCP + TLS handshake) to each routing host up front.
+
+        Sends a HEAD to each host root; the response status does not matter and nothing
+        counts against the API rate limits.
+        """
+        for url in self._warmup_urls(platforms, regions):
+            try:
+                self._session.head(url)
+            except httpx.HTTPError as e:
+                log(f"Warmup of {url} failed: {e}", level="WARNING")
 
     def get_league_entries(
         self,
@@ -254,11 +593,10 @@ class RiotAPI:
         platform: str,
     ) -> Iterable[dict[str, Any]]:
         """Get league for ranks below master"""
-        url = f"{self._platform_host(platform)}/lol/league/v4/entries/{queue}/{tier}/{division}"
+        url = self._league_entries_url(queue, tier, division, platform)
         params = {"page": page} if page is not None else None
         return self._get(url, params=params)
 
-    #@limiter.ratelimit("get_match_ids_by_puuid", delay=True)
     def get_match_ids_by_puuid(
         self,
         puuid: str,
@@ -271,28 +609,53 @@ class RiotAPI:
         start: int | None = None,
         count: int | None = None,
     ) -> Iterable[str]:
-        # Riot API requires quotes around PUUID in the path, URL-encode the quotes
-        encoded_puuid = quote(f'"{puuid}"')
-        url = f"{self._region_host(region)}/lol/match/v5/matches/by-puuid/{encoded_puuid}/ids"
-        params: dict[str, Any] = {}
-        if start_time is not None:
-            params["startTime"] = str(start_time)
-        if end_time is not None:
-            params["endTime"] = str(end_time)
-        if queue is not None:
-            params["queue"] = queue
-        if match_type is not None:
-            params["type"] = match_type
-        if start is not None:
-            params["start"] = start
-        if count is not None:
-            params["count"] = count
-        return self._get(url, params=params or None)
+        url = self._match_ids_url(
+            puuid,
+            region=region,
+            start_time=start_time,
+            end_time=end_time,
+            queue=queue,
+            match_type=match_type,
+            start=start,
+            count=count,
+        )
+        return self._get(url)
 
-    #@limiter.ratelimit("get_match", delay=True)
     def get_match(self, match_id: str, *, region: str = "americas") -> dict[str, Any]:
-        url = f"{self._region_host(region)}/lol/match/v5/matches/{match_id}"
-        return self._get(url)
+        key = (region, match_id)
+        with self._match_cache_lock:
+            cached = self._match_cache.get(key)
+            if cached is not None:
+                self._match_cache.move_to_end(key)
+                return cached
+
+        match = self._get(self._match_url(match_id, region))
+        with self._match_cache_lock:
+            self._match_cache[key] = match
+            if len(self._match_cache) > self._match_cache_size:
+                self._match_cache.popitem(last=False)
+        return match
+
+    def get_matches_bulk(
+        self,
+        match_ids: Iterable[str],
+        *,
+        region: str = "americas",
+        max_workers: int = 16,
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Fetch many matches in parallel, skipping duplicate and already cached ids.
+
+        Requests still go through the shared rate limiter, so max_workers only bounds
+        how many are in flight at once.
+
+        Returns:
+            Mapping of match_id to raw match payload
+        """
+        unique_ids = list(dict.fromkeys(match_ids))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            payloads = executor.map(lambda match_id: self.get_match(match_id, region=region), unique_ids)
+            return dict(zip(unique_ids, payloads))
 
     def get_challenger_league(
         self,
@@ -300,8 +663,7 @@ class RiotAPI:
         *,
         platform: str = "NA1",
     ) -> dict[str, Any]:
-        url = f"{self._platform_host(platform)}/lol/league/v4/challengerleagues/by-queue/{queue}"
-        return self._get(url)
+        return self._get(self._masterplus_league_url(Rank.CHALLENGER, queue, platform))
 
     def get_grandmaster_league(
         self,
@@ -309,8 +671,7 @@ class RiotAPI:
         *,
         platform: str = "NA1",
     ) -> dict[str, Any]:
-        url = f"{self._platform_host(platform)}/lol/league/v4/grandmasterleagues/by-queue/{queue}"
-        return self._get(url)
+        return self._get(self._masterplus_league_url(Rank.GRANDMASTER, queue, platform))
 
     def get_master_league(
         self,
@@ -318,26 +679,7 @@ class RiotAPI:
         *,
         platform: str = "NA1",
     ) -> dict[str, Any]:
-        url = f"{self._platform_host(platform)}/lol/league/v4/masterleagues/by-queue/{queue}"
-        return self._get(url)
-
-    def _route_by_rank_masterplus(
-        self,
-        platform: str,
-        rank: Rank,
-        queue: str = "RANKED_SOLO_5x5",
-    ) -> dict[str, Any]:
-        """Get league data for a specific rank, routing to the appropriate endpoint."""
-
-        # Route to appropriate method based on tier
-        if rank == Rank.CHALLENGER:
-            return self.get_challenger_league(queue=queue, platform=platform)
-        elif rank == Rank.GRANDMASTER:
-            return self.get_grandmaster_league(queue=queue, platform=platform)
-        elif rank == Rank.MASTER:
-            return self.get_master_league(queue=queue, platform=platform)
-        else:
-            raise ValueError(f"Unsupported rank: {rank}")
+        return self._get(self._masterplus_league_url(Rank.MASTER, queue, platform))
 
     def get_league(
         self,
@@ -347,77 +689,199 @@ class RiotAPI:
         page: int | None = None, # only for below-master ranks
     ) -> League:
         """Get league data for a specific rank and return as a League object."""
-        from src.utils.util import rank_enum_to_tier_rank
+        url, params, parse = self._league_request(platform, rank, queue, page)
+        return parse(self._get(url, params=params))
 
-        # Handle master+ ranks (Master, Grandmaster, Challenger)
-        if rank in [Rank.MASTER, Rank.GRANDMASTER, Rank.CHALLENGER]:
-            payload = self._route_by_rank_masterplus(platform=platform, rank=rank, queue=queue)
-            return League.from_masterplus_json(payload)
+    def _get(self, url: str, params: dict[str, Any] | None = None) -> Any:
+        host, method = self._rate_limit_key(url)
+        cache_key, cached, stale = self._cache_lookup(url, params, method)
+        if cached is not None:
+            return self._safe_json_bytes(cached)
+        headers = self._request_headers
+        if stale is not None:
+            headers = {**headers, "If-None-Match": stale[0]}
+        attempt = 0
+        while True:
+            rate_limiter.acquire(host, method)
+            log("Querying riot api", url=url, params=params)
+            response = self._session.get(url, params=params, headers=headers)
+            rate_limiter.record_response(host, method, response.status_code, response.headers)
+            delay = self._retry_delay(response.status_code, attempt)
+            if delay is None:
+                break
+            time.sleep(delay)
+            attempt += 1
+        return self._handle_response(url, method, response, cache_key, stale)
+
+
+class AsyncRiotAPI(_RiotAPIBase):
+    """
+    asyncio counterpart of RiotAPI for crawling many players/matches concurrently.
+
+    All requests share one HTTP/2 client, so concurrent requests to a host are
+    multiplexed over a single TLS connection, and go through the same shared rate
+    limiter as RiotAPI. Use as an async context manager:
+
+        async with AsyncRiotAPI() as api:
+            match = await api.get_match(match_id)
+    """
 
-        # Handle below-master ranks (need tier and division)
-        tier, division = rank_enum_to_tier_rank(rank)
-        # Convert tier to API format (uppercase first letter, rest lowercase)
-        tier_api = tier.capitalize()
-        # Convert division to API format (uppercase)
-        division_api = division.upper() if division else None
-        
-        if division_api is None:
-            raise ValueError(f"Rank {rank} requires a division")
-        
-        entries = self.get_league_entries(
-            queue=queue,
-            tier=tier_api,
-            division=division_api,
-            platform=platform,
-            page=page,
+    def __init__(
+        self,
+        api_key: str | None = None,
+        *,
+        timeout: int = 10,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        cache: ResponseCache | None = None,
+        event_hooks: dict[str, list[Callable[..., Any]]] | None = None,
+    ) -> None:
+        super().__init__(api_key, timeout=timeout, cache=cache)
+        # Passed to the httpx client, e.g. to observe every response (latency testing)
+        self._event_hooks = event_hooks
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=KEEPALIVE_EXPIRY_S,
         )
-        # get_league_entries returns an iterable, convert to list
-        entries_list = list(entries) if isinstance(entries, Iterable) else entries
-        return League.from_belowmaster_json(entries_list)
+        self._session: httpx.AsyncClient | None = None
 
-    @global_limiter.ratelimit("get", delay=True)
-    def _get(self, url: str, params: dict[str, Any] | None = None) -> Any:
-        log("Querying riot api", url=url, params=params)
-        response = self._session.get(
-            url,
-            params=params,
-            headers=self._headers(),
+    async def __aenter__(self) -> "AsyncRiotAPI":
+        # The client binds to the running event loop, so it is created here, not in __init__
+        self._session = httpx.AsyncClient(
+            http2=True,
+            headers=self._request_headers,
             timeout=self._timeout,
+            limits=self._limits,
+            transport=httpx.AsyncHTTPTransport(http2=True, limits=self._limits, retries=2),
+            event_hooks=self._event_hooks,
         )
-        if not response.ok:
-            raise RiotAPIError(
-                url=url,
-                status_code=response.status_code,
-                payload=self._safe_json(response),
-            )
-        return self._safe_json(response)
+        return self
 
-    def _headers(self) -> dict[str, str]:
-        headers = dict(DEFAULT_HEADERS)
-        headers["X-Riot-Token"] = self._token
-        return headers
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
 
-    @staticmethod
-    def _platform_host(platform: str) -> str:
-        # BR1, EUN1, EUW1, JP1, KR, LA1, LA2, ME1, NA1, OC1, RU, SG2, TR1, TW2, VN2
-        # Use these platform routing values for everything other than match endpoints (i.e., league).
-        return f"https://{platform.lower()}.api.riotgames.com"
+    async def close(self) -> None:
+        """Close the underlying HTTP session."""
+        if self._session is not None:
+            await self._session.aclose()
+            self._session = None
 
-    @staticmethod
-    def _region_host(region: str) -> str:
-        # There is americas (NA, BR, LAN and LAS), asia (KR, JP), sea (OCE, SG2, TW2 and VN2), europe (EUNE, EUW, ME1, TR and RU)
-        # ONLY for matches API.
-        return f"https://{region.lower()}.api.riotgames.com"
+    async def warmup(self, *, platforms: Iterable[str] = (), regions: Iterable[str] = ()) -> None:
+        """Async variant of RiotAPI.warmup; all hosts are warmed concurrently."""
+        if self._session is None:
+            raise RuntimeError("AsyncRiotAPI must be used as 'async with AsyncRiotAPI() as api'")
 
-    @staticmethod
-    def _safe_json(response: requests.Response) -> Any:
-        try:
-            return response.json()
-        except ValueError:
-            return response.text
+        async def head(url: str) -> None:
+            try:
+                await self._session.head(url)
+            except httpx.HTTPError as e:
+                log(f"Warmup of {url} failed: {e}", level="WARNING")
 
+        await asyncio.gather(*(head(url) for url in self._warmup_urls(platforms, regions)))
 
-__all__ = ["Match", "MatchParticipant", "League", "RiotAPI", "RiotAPIError"]
+    async def get_league_entries(
+        self,
+        queue: str = "RANKED_SOLO_5x5",
+        tier: str = "DIAMOND",
+        division: str = "I",
+        *,
+        page: int | None = None,
+        platform: str,
+    ) -> list[dict[str, Any]]:
+        """Get league for ranks below master"""
+        url = self._league_entries_url(queue, tier, division, platform)
+        params = {"page": page} if page is not None else None
+        return await self._get(url, params=params)
+
+    async def get_match_ids_by_puuid(
+        self,
+        puuid: str,
+        *,
+        region: str = "americas",
+        start_time: int | None = None,
+        end_time: int | None = None,
+        queue: int | None = 420,  # sr ranked solo
+        match_type: str | None = "ranked",
+        start: int | None = None,
+        count: int | None = None,
+    ) -> list[str]:
+        url = self._match_ids_url(
+            puuid,
+            region=region,
+            start_time=start_time,
+            end_time=end_time,
+            queue=queue,
+            match_type=match_type,
+            start=start,
+            count=count,
+        )
+        return await self._get(url)
+
+    async def get_match(self, match_id: str, *, region: str = "americas") -> dict[str, Any]:
+        return await self._get(self._match_url(match_id, region))
+
+    async def get_matches_bulk(
+        self,
+        match_ids: Iterable[str],
+        *,
+        region: str = "americas",
+        max_concurrency: int = 20,
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Fetch many matches concurrently, skipping duplicate ids.
+
+        Requests still go through the shared rate limiter, so max_concurrency only
+        bounds how many are in flight at once.
+
+        Returns:
+            Mapping of match_id to raw match payload
+        """
+        unique_ids = list(dict.fromkeys(match_ids))
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(match_id: str) -> dict[str, Any]:
+            async with semaphore:
+                return await self.get_match(match_id, region=region)
+
+        payloads = await asyncio.gather(*(fetch(match_id) for match_id in unique_ids))
+        return dict(zip(unique_ids, payloads))
+
+    async def get_league(
+        self,
+        platform: str,
+        rank: Rank,
+        queue: str = "RANKED_SOLO_5x5",
+        page: int | None = None, # only for below-master ranks
+    ) -> League:
+        """Get league data for a specific rank and return as a League object."""
+        url, params, parse = self._league_request(platform, rank, queue, page)
+        return parse(await self._get(url, params=params))
+
+    async def _get(self, url: str, params: dict[str, Any] | None = None) -> Any:
+        if self._session is None:
+            raise RuntimeError("AsyncRiotAPI must be used as 'async with AsyncRiotAPI() as api'")
+        host, method = self._rate_limit_key(url)
+        cache_key, cached, stale = self._cache_lookup(url, params, method)
+        if cached is not None:
+            return self._safe_json_bytes(cached)
+        # The client already sends the default headers; only a revalidation adds one
+        headers = {"If-None-Match": stale[0]} if stale is not None else None
+        attempt = 0
+        while True:
+            await rate_limiter.acquire_async(host, method)
+            log("Querying riot api", url=url, params=params)
+            response = await self._session.get(url, params=params, headers=headers)
+            rate_limiter.record_response(host, method, response.status_code, response.headers)
+            delay = self._retry_delay(response.status_code, attempt)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+            attempt += 1
+        return self._handle_response(url, method, response, cache_key, stale)
+
+
+__all__ = ["Match", "MatchParticipant", "League", "RiotAPI", "AsyncRiotAPI", "RiotAPIError"]
 
 
 def _main() -> None:
@@ -455,7 +919,6 @@ def _main() -> None:
     # grandmaster_league = League.from_masterplus_json(grandmaster_payload)
     # print("Grandmaster League:", grandmaster_league)
 
-    api = RiotAPI()
     puuid = "ztT2H_3CFSD_wAuniuqzff1CNu2fpNRvKpHguidxsyJammiKxA2yP14K7nGnxr-gB0obLNK8eMsM9Q"
     matches = api.get_match_ids_by_puuid(puuid, region="americas")
     print(matches)
@@ -10,45 +10,84 @@ RIOT_API_KEY must be set in your environment (.env supported by the wrapper).
 
 from __future__ import annotations
 
+import asyncio
+from collections import defaultdict
+from contextvars import ContextVar
+from datetime import timedelta
 from types import SimpleNamespace
-import statistics
 import time
-from typing import Callable, Any
+from typing import Awaitable, Callable, Any
 
-from src.data.riot_api import RiotAPI
+import httpx
+import numpy as np
 
+try:  # uvloop is not available on Windows; the default event loop is used there
+    import uvloop
+except ImportError:
+    uvloop = None
 
-def measure_latency(fn: Callable[[], Any], *, iterations: int, label: str) -> None:
-    """Measure and print latency stats for a zero-arg callable.
+from src.data.riot_api import AsyncRiotAPI
+from src.utils.util import Rank
 
-    Each iteration runs independently; exceptions are caught and reported.
-    """
-    durations: list[float] = []
-    errors: list[str] = []
 
-    print(f"\n=== {label} (iterations={iterations}) ===")
-    for i in range(1, iterations + 1):
-        start = time.perf_counter()
+# Responses received on behalf of the iteration running in the current task. Each timed
+# iteration runs in its own task, so the list set there is private to that iteration
+# (and shared with any subtasks it spawns, e.g. get_matches_bulk's fetches).
+_iteration_responses: ContextVar[list[httpx.Response] | None] = ContextVar(
+    "_iteration_responses", default=None
+)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+async def _record_response(response: httpx.Response) -> None:
+    """httpx response hook: remember the response for the current iteration."""
+    responses = _iteration_responses.get()
+    if responses is not None:
+        responses.append(response)
+
+
+def _round_trips_ns(responses: list[httpx.Response]) -> list[int]:
+    """HTTP round-trip times of completed responses, in nanoseconds.
+
+    Response.elapsed runs from sending the request to finishing reading the body, so it
+    leaves out the time a request spent queued on the client-side rate limiter.
+    """
+    round_trips_ns = []
+    for response in responses:
         try:
-            _ = fn()
-        except Exception as exc:  # noqa: BLE001
-            elapsed = time.perf_counter() - start
-            errors.append(f"iter {i}: {exc!r}")
-            print(f"  iter {i}: ERROR after {elapsed*1000:.1f} ms -> {exc!r}")
-        else:
-            elapsed = time.perf_counter() - start
-            durations.append(elapsed)
-            print(f"  iter {i}: {elapsed*1000:.1f} ms")
-
-    if durations:
-        avg_ms = statistics.mean(durations) * 1000
-        p50_ms = statistics.median(durations) * 1000
-        min_ms = min(durations) * 1000
-        max_ms = max(durations) * 1000
-        # crude p95
-        sorted_durs = sorted(durations)
-        idx95 = max(0, int(round(0.95 * (len(sorted_durs) - 1))))
-        p95_ms = sorted_durs[idx95] * 1000
+            round_trips_ns.append(response.elapsed // _ONE_MICROSECOND * 1000)
+        except RuntimeError:  # body never read (request failed mid-response)
+            pass
+    return round_trips_ns
+
+
+async def _timed_iteration(
+    fn: Callable[[], Awaitable[Any]],
+) -> tuple[int, list[int], Exception | None]:
+    """Run one iteration; return its wall time, its HTTP round trips and any exception."""
+    responses: list[httpx.Response] = []
+    _iteration_responses.set(responses)
+    start = time.perf_counter_ns()
+    try:
+        await fn()
+    except Exception as exc:  # noqa: BLE001
+        return time.perf_counter_ns() - start, _round_trips_ns(responses), exc
+    return time.perf_counter_ns() - start, _round_trips_ns(responses), None
+
+
+def _summarize(durations_ns: list[int], errors: list[str]) -> None:
+    """Print latency stats for the measured durations and the error count.
+
+    Durations are integer nanoseconds; they are converted to milliseconds only here,
+    once per test rather than once per iteration.
+    """
+    arr = np.fromiter(durations_ns, dtype=np.int64, count=len(durations_ns)) / 1e6
+    if arr.size:
+        avg_ms = arr.mean()
+        min_ms = arr.min()
+        max_ms = arr.max()
+        # np.percentile selects with a partition rather than sorting the whole array
+        p50_ms, p95_ms = np.percentile(arr, [50, 95])
 
         print(
             "  -> stats: "
@@ -59,6 +98,163 @@ def measure_latency(fn: Callable[[], Any], *, iterations: int, label: str) -> No
         print(f"  -> {len(errors)} error(s)")
 
 
+async def measure_latency_async(
+    fn: Callable[[], Awaitable[Any]], *, iterations: int, label: str
+) -> None:
+    """Measure and print latency stats for a zero-arg coroutine function.
+
+    All iterations run concurrently; exceptions are caught and reported.
+
+    Stats are over HTTP round trips (see _round_trips_ns), not wall time: concurrent
+    iterations queue on the shared rate limiter, and that wait is not network latency.
+    Each iteration also prints its wall time, so the gap shows the queueing.
+    """
+    print(f"\n=== {label} (iterations={iterations}, concurrent) ===")
+    results = await asyncio.gather(*(_timed_iteration(fn) for _ in range(iterations)))
+
+    durations_ns: list[int] = []
+    errors: list[str] = []
+    for i, (wall_ns, round_trips_ns, exc) in enumerate(results, start=1):
+        durations_ns.extend(round_trips_ns)
+        if exc is not None:
+            errors.append(f"iter {i}: {exc!r}")
+            print(f"  iter {i}: ERROR after {wall_ns / 1e6:.1f} ms -> {exc!r}")
+        elif len(round_trips_ns) == 1:
+            print(
+                f"  iter {i}: {round_trips_ns[0] / 1e6:.1f} ms round trip "
+                f"({wall_ns / 1e6:.1f} ms including rate limiter wait)"
+            )
+        else:
+            print(f"  iter {i}: {len(round_trips_ns)} round trips in {wall_ns / 1e6:.1f} ms")
+
+    _summarize(durations_ns, errors)
+
+
+async def measure_latencies(
+    tasks: list[tuple[str, Callable[[], Awaitable[Any]]]],
+    *,
+    iterations: int,
+    max_concurrency: int = 10,
+) -> None:
+    """Time several endpoints as one interleaved, mixed workload.
+
+    Calls are issued round-robin (a, b, c, a, b, c, ...) with at most max_concurrency
+    in flight, so endpoints share warm connections the way a real crawl does and
+    head-of-line effects between them show up. Stats are printed per label at the end.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def timed(
+        label: str, fn: Callable[[], Awaitable[Any]]
+    ) -> tuple[str, list[int], Exception | None]:
+        async with semaphore:
+            _, round_trips_ns, exc = await _timed_iteration(fn)
+        return label, round_trips_ns, exc
+
+    print(
+        f"\n=== interleaved: {len(tasks)} endpoints (iterations={iterations}, "
+        f"max_concurrency={max_concurrency}) ==="
+    )
+    results = await asyncio.gather(
+        *(timed(label, fn) for _ in range(iterations) for label, fn in tasks)
+    )
+
+    durations_ns: defaultdict[str, list[int]] = defaultdict(list)
+    errors: defaultdict[str, list[str]] = defaultdict(list)
+    for label, round_trips_ns, exc in results:
+        durations_ns[label].extend(round_trips_ns)
+        if exc is not None:
+            errors[label].append(repr(exc))
+
+    for label, _ in tasks:
+        print(f"  {label}")
+        _summarize(durations_ns[label], errors[label])
+
+
+async def _run(args: SimpleNamespace) -> None:
+    # One client, so every iteration reuses the same pooled keep-alive connections
+    async with AsyncRiotAPI(event_hooks={"response": [_record_response]}) as api:
+        # Pay for the TCP + TLS handshakes before timing so iteration 1 is not inflated
+        start = time.perf_counter_ns()
+        await api.warmup(platforms=[args.platform], regions=[args.region])
+        print(f"[warmup] connected to {args.platform} and {args.region} hosts in "
+              f"{(time.perf_counter_ns() - start) / 1e6:.1f} ms")
+
+        # League endpoints (do not require PUUID/Match ID)
+        for rank in (Rank.CHALLENGER, Rank.GRANDMASTER, Rank.MASTER):
+            await measure_latency_async(
+                lambda rank=rank: api.get_league(platform=args.platform, rank=rank),
+                iterations=args.iterations,
+                label=f"get_league(platform={args.platform}, rank={rank.name})",
+            )
+
+        # Match IDs by PUUID (optional)
+        if args.puuid:
+            await measure_latency_async(
+                lambda: api.get_match_ids_by_puuid(
+                    args.puuid,
+                    region=args.region,
+                    start_time=args.start_time,
+                    end_time=args.end_time,
+                    start=0,
+                    count=args.count,
+                ),
+                iterations=args.iterations,
+                label=(
+                    f"get_match_ids_by_puuid(puuid=<hidden>, region={args.region}, "
+                    f"count={args.count}, start_time={args.start_time}, end_time={args.end_time})"
+                ),
+            )
+        else:
+            print("\n(skipped) get_match_ids_by_puuid: provide --puuid to enable")
+
+        # Match by ID (optional)
+        if args.match_id:
+            await measure_latency_async(
+                lambda: api.get_match(args.match_id, region=args.region),
+                iterations=args.iterations,
+                label=f"get_match(match_id=<hidden>, region={args.region})",
+            )
+            # A larger burst shows how well concurrent requests share the HTTP/2 connection
+            await measure_latency_async(
+                lambda: api.get_match(args.match_id, region=args.region),
+                iterations=args.burst,
+                label=f"get_match x {args.burst} concurrent (match_id=<hidden>, region={args.region})",
+            )
+        else:
+            print("\n(skipped) get_match: provide --match-id to enable")
+
+        # Bulk fetch of a player's recent matches (optional)
+        if args.puuid:
+            match_ids = await api.get_match_ids_by_puuid(
+                args.puuid, region=args.region, start=0, count=args.count
+            )
+            await measure_latency_async(
+                lambda: api.get_matches_bulk(match_ids, region=args.region),
+                iterations=args.iterations,
+                label=f"get_matches_bulk({len(match_ids)} matches, region={args.region})",
+            )
+        else:
+            print("\n(skipped) get_matches_bulk: provide --puuid to enable")
+
+        # Every endpoint above at once, interleaved over the same connections
+        tasks: list[tuple[str, Callable[[], Awaitable[Any]]]] = [
+            (f"get_league(rank={rank.name})",
+             lambda rank=rank: api.get_league(platform=args.platform, rank=rank))
+            for rank in (Rank.CHALLENGER, Rank.GRANDMASTER, Rank.MASTER)
+        ]
+        if args.puuid:
+            tasks.append((
+                "get_match_ids_by_puuid",
+                lambda: api.get_match_ids_by_puuid(
+                    args.puuid, region=args.region, start=0, count=args.count
+                ),
+            ))
+        if args.match_id:
+            tasks.append(("get_match", lambda: api.get_match(args.match_id, region=args.region)))
+        await measure_latencies(tasks, iterations=args.iterations)
+
+
 def main() -> None:
     # argparse temporarily disabled; fill values below instead
     # parser = argparse.ArgumentParser(description="Latency tests for RiotAPI wrapper")
@@ -83,58 +279,15 @@ def main() -> None:
         puuid="CcfFcULr3L2rU_JVD6AkuYv_KkTCgYJD9mDKdZZeI0lzig3-bLLet_JV_-SXHdk3L1pAYNJKjyM1oA",        # e.g., "<PUUID>"
         match_id="NA1_5398512753",     # e.g., "<MATCH_ID>"
         count=5,
+        burst=20,
         start_time=None,
         end_time=None,
     )
 
-    api = RiotAPI()
-
-    # League endpoints (do not require PUUID/Match ID)
-    measure_latency(
-        lambda: api.get_challenger_league(platform=args.platform),
-        iterations=args.iterations,
-        label=f"get_challenger_league(platform={args.platform})",
-    )
-    measure_latency(
-        lambda: api.get_grandmaster_league(platform=args.platform),
-        iterations=args.iterations,
-        label=f"get_grandmaster_league(platform={args.platform})",
-    )
-    measure_latency(
-        lambda: api.get_master_league(platform=args.platform),
-        iterations=args.iterations,
-        label=f"get_master_league(platform={args.platform})",
-    )
-
-    # Match IDs by PUUID (optional)
-    if args.puuid:
-        measure_latency(
-            lambda: api.get_match_ids_by_puuid(
-                args.puuid,
-                region=args.region,
-                start_time=args.start_time,
-                end_time=args.end_time,
-                start=0,
-                count=args.count,
-            ),
-            iterations=args.iterations,
-            label=(
-                f"get_match_ids_by_puuid(puuid=<hidden>, region={args.region}, "
-                f"count={args.count}, start_time={args.start_time}, end_time={args.end_time})"
-            ),
-        )
-    else:
-        print("\n(skipped) get_match_ids_by_puuid: provide --puuid to enable")
-
-    # Match by ID (optional)
-    if args.match_id:
-        measure_latency(
-            lambda: api.get_match(args.match_id, region=args.region),
-            iterations=args.iterations,
-            label=f"get_match(match_id=<hidden>, region={args.region})",
-        )
-    else:
-        print("\n(skipped) get_match: provide --match-id to enable")
+    if uvloop is not None:
+        # libuv-based loop: cheaper socket callbacks and scheduling under concurrent load
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    asyncio.run(_run(args))
 
 
 if __name__ == "__main__":
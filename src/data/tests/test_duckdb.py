@@ -0,0 +1,153 @@
+import duckdb
+import pytest
+
+from data.duckdb import MatchDatabase, QueryProgressTracker, id_hash
+from data.riot_api import Match, MatchParticipant
+from utils.util import Rank
+
+
+def make_match(match_id: str, num_participants: int = 10) -> Match:
+    participants = [
+        MatchParticipant(
+            puuid=f"{match_id}-puuid-{index}",
+            champion="Camille",
+            individual_position="TOP",
+            team_position="TOP",
+            team_id=100 if index < 5 else 200,
+            win=index < 5,
+        )
+        for index in range(num_participants)
+    ]
+    return Match(
+        match_id=match_id,
+        game_creation=1760831116385,
+        game_duration=1658,
+        game_end_timestamp=1760832858276,
+        game_mode="CLASSIC",
+        game_start_timestamp=1760831199921,
+        game_type="MATCHED_GAME",
+        game_version="15.20.719.545",
+        participants=participants,
+    )
+
+
+def test_upsert_many_inserts_matches_and_participants():
+    match = make_match("NA1_1")
+    match.set_rank(Rank.GRANDMASTER)
+    with MatchDatabase(":memory:") as db:
+        assert db.upsert_many([match, make_match("NA1_2")]) == 2
+
+        assert db.con.execute("SELECT COUNT(*) FROM matches").fetchone()[0] == 2
+        assert db.con.execute("SELECT COUNT(*) FROM participants").fetchone()[0] == 20
+        row = db.con.execute(
+            "SELECT team_id, win, rank_num FROM participants WHERE puuid = 'NA1_1-puuid-0'"
+        ).fetchone()
+        assert row == (100, True, Rank.GRANDMASTER.value)
+        assert db.con.execute(
+            "SELECT match_id_hash FROM matches WHERE match_id = 'NA1_1'"
+        ).fetchone()[0] == id_hash("NA1_1")
+
+
+def test_upsert_many_ignores_duplicates():
+    with MatchDatabase(":memory:") as db:
+        db.upsert_many([make_match("NA1_1")])
+        db.upsert_many([make_match("NA1_1"), make_match("NA1_2")])
+
+        assert db.con.execute("SELECT COUNT(*) FROM matches").fetchone()[0] == 2
+        assert db.con.execute("SELECT COUNT(*) FROM participants").fetchone()[0] == 20
+
+
+def test_unknown_positions_are_stored_as_null():
+    match = make_match("NA1_1", num_participants=2)
+    match.participants[0].individual_position = "NONE"
+    match.participants[1].team_position = ""
+    with MatchDatabase(":memory:") as db:
+        assert db.upsert_many([match]) == 1
+
+        rows = db.con.execute(
+            "SELECT individual_position, team_position FROM participants ORDER BY puuid"
+        ).fetchall()
+        assert rows == [(None, "TOP"), ("TOP", "")]
+
+
+def test_get_only_new_match_ids():
+    with MatchDatabase(":memory:") as db:
+        db.upsert_many([make_match("NA1_1")])
+
+        assert db.get_only_new_match_ids({"NA1_1", "NA1_2"}) == {"NA1_2"}
+        assert db.get_only_new_match_ids(set()) == set()
+
+
+def test_known_match_ids_survive_reopen(tmp_path):
+    db_path = str(tmp_path / "matches.duckdb")
+    with MatchDatabase(db_path) as db:
+        db.upsert_match(make_match("NA1_1"))
+
+    with MatchDatabase(db_path) as db:
+        assert db.get_only_new_match_ids({"NA1_1", "NA1_2"}) == {"NA1_2"}
+        db.clear_all_data()
+        assert db.get_only_new_match_ids({"NA1_1"}) == {"NA1_1"}
+
+
+def test_known_match_ids_are_loaded_from_existing_rows(tmp_path):
+    db_path = str(tmp_path / "matches.duckdb")
+    match_ids = [f"NA1_{i}" for i in range(500)]
+    with MatchDatabase(db_path) as db:
+        db.upsert_many([make_match(match_id, num_participants=1) for match_id in match_ids])
+
+    with MatchDatabase(db_path) as db:
+        assert all(match_id in db._known_match_ids for match_id in match_ids)
+        assert db.get_only_new_match_ids(set(match_ids)) == set()
+
+
+def test_bloom_filter_hits_are_confirmed_against_the_table():
+    with MatchDatabase(":memory:") as db:
+        db.upsert_many([make_match("NA1_1")])
+        # Simulate a false positive: the filter claims an id the table does not have
+        db._known_match_ids.add("NA1_2")
+
+        assert db.get_only_new_match_ids({"NA1_1", "NA1_2"}) == {"NA1_2"}
+
+
+def test_legacy_match_id_keyed_file_is_rejected(tmp_path):
+    db_path = str(tmp_path / "matches.duckdb")
+    con = duckdb.connect(db_path)
+    con.execute("CREATE TABLE matches (match_id TEXT PRIMARY KEY, game_creation BIGINT)")
+    con.execute(
+        "CREATE TABLE participants (match_id TEXT, puuid TEXT, PRIMARY KEY (match_id, puuid))"
+    )
+    con.close()
+
+    with pytest.raises(RuntimeError, match="old match_id-keyed layout"):
+        MatchDatabase(db_path)
+
+
+def test_query_progress_bulk_round_trip():
+    with MatchDatabase(":memory:") as db:
+        tracker = QueryProgressTracker(db)
+        tracker.update_start_index("NA1", "start", "end", "a", 4)
+        tracker.update_start_indices("NA1", "start", "end", {"a": 6, "b": 2})
+
+        assert tracker.get_query_start_indices("NA1", "start", "end", ["a", "b", "c"]) == {
+            "a": 6,
+            "b": 2,
+            "c": 0,
+        }
+        assert tracker.get_query_start_indices("KR", "start", "end", ["a"]) == {"a": 0}
+        assert tracker.get_query_start_index("NA1", "start", "end", "b") == 2
+
+
+def test_transaction_groups_upsert_and_progress():
+    with MatchDatabase(":memory:") as db:
+        tracker = QueryProgressTracker(db)
+        try:
+            with db.transaction():
+                db.upsert_many([make_match("NA1_1")])
+                tracker.update_start_indices("NA1", "start", "end", {"a": 2})
+                raise RuntimeError("interrupted")
+        except RuntimeError:
+            pass
+
+        assert db.con.execute("SELECT COUNT(*) FROM matches").fetchone()[0] == 0
+        assert tracker.get_query_start_index("NA1", "start", "end", "a") == 0
+        assert db.get_only_new_match_ids({"NA1_1"}) == {"NA1_1"}
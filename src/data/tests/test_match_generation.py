@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from data import match_generation
+from data.duckdb import MatchDatabase, QueryProgressTracker
+from data.riot_api import League
+from utils.util import Rank
+
+
+PAGE_SIZE = 5
+NUM_PAGES = 2
+
+
+class FakeAsyncRiotAPI:
+    """Two league pages of players, where player i has 3 * (i + 1) matches."""
+
+    def __init__(self, *args, **kwargs):
+        players = [f"puuid-{i}" for i in range(PAGE_SIZE * NUM_PAGES)]
+        self.match_ids = {
+            puuid: [f"NA1_{i}{j:03d}" for j in range(3 * (i + 1))]
+            for i, puuid in enumerate(players)
+        }
+        self.pages = [players[i : i + PAGE_SIZE] for i in range(0, len(players), PAGE_SIZE)]
+        self.pages_requested: list[int] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return None
+
+    async def warmup(self, *, platforms=(), regions=()):
+        return None
+
+    async def get_league(self, platform, rank, queue="RANKED_SOLO_5x5", page=None):
+        self.pages_requested.append(page)
+        players = self.pages[page - 1] if page <= len(self.pages) else []
+        return League(players=list(players), tier="DIAMOND", rank="I")
+
+    async def get_match_ids_by_puuid(self, puuid, *, start=None, count=None, **kwargs):
+        if count > 100:
+            raise RuntimeError(f"count={count} is a 400 from match-v5")
+        return self.match_ids[puuid][start : start + count]
+
+    async def get_match(self, match_id, *, region="americas"):
+        return {
+            "metadata": {"matchId": match_id},
+            "info": {
+                "gameCreation": 1760831116385,
+                "gameDuration": 1658,
+                "gameEndTimestamp": 1760832858276,
+                "gameMode": "CLASSIC",
+                "gameStartTimestamp": 1760831199921,
+                "gameType": "MATCHED_GAME",
+                "gameVersion": "15.20.719.545",
+                "participants": [],
+            },
+        }
+
+
+@pytest.mark.parametrize("target_matches", [200, 5000])
+def test_query_matches_wraps_pages_until_players_are_exhausted(monkeypatch, target_matches):
+    apis: list[FakeAsyncRiotAPI] = []
+
+    def make_api(*args, **kwargs):
+        apis.append(FakeAsyncRiotAPI())
+        return apis[-1]
+
+    monkeypatch.setattr(match_generation, "AsyncRiotAPI", make_api)
+    with MatchDatabase(":memory:") as db:
+        processed = asyncio.run(match_generation._query_matches(
+            "NA1",
+            Rank.DIAMOND_I,
+            "2025-11-01T00:00:00",
+            "2025-11-04T00:00:00",
+            target_matches,
+            db,
+            QueryProgressTracker(db),
+        ))
+
+        total_matches = sum(len(ids) for ids in apis[0].match_ids.values())
+        # Neither target is reachable, so the run only ends once every player is exhausted
+        assert processed == total_matches
+        assert db.con.execute("SELECT COUNT(*) FROM matches").fetchone()[0] == total_matches
+    # The empty page past the end sends the crawl back to the first page
+    assert apis[0].pages_requested[:4] == [1, 2, 3, 1]
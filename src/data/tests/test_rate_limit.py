@@ -0,0 +1,51 @@
+import pytest
+
+from data.rate_limit import RiotRateLimiter, parse_rate_limit
+
+HOST = "americas.api.riotgames.com"
+METHOD = "/lol/match/v5/matches/{}"
+
+
+def test_parse_rate_limit():
+    assert parse_rate_limit("20:1,100:120") == [(20, 1), (100, 120)]
+    with pytest.raises(ValueError):
+        parse_rate_limit("20")
+
+
+def test_reserve_waits_for_shortest_full_window():
+    limiter = RiotRateLimiter("2:1,3:10")
+    assert limiter.reserve(HOST, METHOD, now=0.0) == 0
+    assert limiter.reserve(HOST, METHOD, now=0.0) == 0
+    # 2 per second used up, the third request goes out when the first leaves the window
+    assert limiter.reserve(HOST, METHOD, now=0.0) == pytest.approx(1.0)
+    # 3 per 10 seconds used up, so the fourth waits for the 10s window
+    assert limiter.reserve(HOST, METHOD, now=1.0) == pytest.approx(9.0)
+
+
+def test_headers_update_limits_and_counts():
+    limiter = RiotRateLimiter("100:1")
+    limiter.record_response(
+        HOST,
+        METHOD,
+        200,
+        {
+            "X-App-Rate-Limit": "100:1",
+            "X-App-Rate-Limit-Count": "1:1",
+            "X-Method-Rate-Limit": "2:10",
+            "X-Method-Rate-Limit-Count": "2:10",
+        },
+        now=0.0,
+    )
+    # Method window is already full according to Riot's count
+    assert limiter.reserve(HOST, METHOD, now=0.0) == pytest.approx(10.0)
+    # Other methods on the same host are not affected
+    assert limiter.reserve(HOST, "/lol/match/v5/matches/by-puuid/{}/ids", now=0.0) == 0
+
+
+def test_429_blocks_scope_for_retry_after():
+    limiter = RiotRateLimiter("100:1")
+    limiter.record_response(
+        HOST, METHOD, 429, {"Retry-After": "5", "X-Rate-Limit-Type": "application"}, now=0.0
+    )
+    assert limiter.reserve(HOST, METHOD, now=0.0) == pytest.approx(5.0)
+    assert limiter.reserve("na1.api.riotgames.com", METHOD, now=0.0) == 0
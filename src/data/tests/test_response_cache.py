@@ -0,0 +1,32 @@
+from data.response_cache import ResponseCache
+
+
+def test_key_ignores_param_order():
+    assert ResponseCache.key("u", {"b": 2, "a": 1}) == ResponseCache.key("u", {"a": 1, "b": 2})
+    assert ResponseCache.key("u", None) == "u"
+
+
+def test_get_set_and_expiry(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    with ResponseCache(path) as cache:
+        cache.set("forever", b'{"a": 1}')
+        cache.set("expired", b"[]", ttl=-1)
+        assert cache.get("forever") == b'{"a": 1}'
+        assert cache.get("expired") is None
+        assert cache.get("missing") is None
+
+    # Entries survive reopening the cache
+    with ResponseCache(path) as cache:
+        assert cache.get("forever") == b'{"a": 1}'
+
+
+def test_expired_entry_with_etag_can_be_revalidated():
+    with ResponseCache(":memory:") as cache:
+        cache.set("league", b"{}", ttl=-1, etag='"v1"')
+        cache.set("no-etag", b"{}", ttl=-1)
+        assert cache.get("league") is None
+        assert cache.get_revalidatable("league") == ('"v1"', b"{}")
+        assert cache.get_revalidatable("no-etag") is None
+
+        cache.refresh("league", ttl=60)
+        assert cache.get("league") == b"{}"
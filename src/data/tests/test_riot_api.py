@@ -1,6 +1,12 @@
-import requests
+import copy
 
+import httpx
+import orjson
+import pytest
+
+from data.response_cache import ResponseCache
 from data.riot_api import Match, RiotAPI
+from utils.util import Rank
 
 
 MATCH_ID = "NA1_5395834007"
@@ -31,11 +37,71 @@ MATCH_RESPONSE = {
 }
 
 
+def _mocked_match_response() -> dict:
+    """MATCH_RESPONSE padded out to a full 10-player lobby."""
+    payload = copy.deepcopy(MATCH_RESPONSE)
+    participants = payload["info"]["participants"]
+    for i in range(1, 10):
+        participants.append(
+            {
+                **participants[0],
+                "puuid": f"puuid-{i}",
+                "teamId": 100 if i < 5 else 200,
+                "win": i >= 5,
+            }
+        )
+    return payload
+
+
 def test_get_match_parses_into_match():
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.host == "americas.api.riotgames.com"
+        assert request.url.path == f"/lol/match/v5/matches/{MATCH_ID}"
+        assert request.headers["X-Riot-Token"] == "test"
+        return httpx.Response(200, content=orjson.dumps(_mocked_match_response()))
+
+    with RiotAPI(api_key="test", session=httpx.Client(transport=httpx.MockTransport(handler))) as api:
+        raw_match = api.get_match(MATCH_ID, region="americas")
+    match = Match.from_json(raw_match)
+
+    _assert_matches_response(match)
+
+
+def test_response_cache_keeps_leagues_but_not_match_bodies():
+    requested_paths: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested_paths.append(request.url.path)
+        if request.url.path.startswith("/lol/match/"):
+            return httpx.Response(200, content=orjson.dumps(_mocked_match_response()))
+        return httpx.Response(
+            200, content=orjson.dumps({"tier": "CHALLENGER", "entries": [{"puuid": "p"}]})
+        )
+
+    with ResponseCache(":memory:") as cache:
+        # Separate clients, so only the shared ResponseCache can save a request
+        for _ in range(2):
+            session = httpx.Client(transport=httpx.MockTransport(handler))
+            with RiotAPI(api_key="test", session=session, cache=cache) as api:
+                api.get_match(MATCH_ID, region="americas")
+                api.get_league(platform="NA1", rank=Rank.CHALLENGER)
+
+    assert requested_paths.count(f"/lol/match/v5/matches/{MATCH_ID}") == 2
+    assert requested_paths.count("/lol/league/v4/challengerleagues/by-queue/RANKED_SOLO_5x5") == 1
+
+
+@pytest.mark.integration
+def test_get_match_parses_into_match_live():
+    """Same check against the real API; needs RIOT_API_KEY (run with -m integration)."""
     api = RiotAPI()
     raw_match = api.get_match(MATCH_ID, region="americas")
     match = Match.from_json(raw_match)
 
+    _assert_matches_response(match)
+
+
+def _assert_matches_response(match: Match) -> None:
+
     assert match.match_id == MATCH_ID
     assert match.game_creation == MATCH_RESPONSE["info"]["gameCreation"]
     assert match.game_duration == MATCH_RESPONSE["info"]["gameDuration"]
@@ -49,7 +115,7 @@ def test_get_match_parses_into_match():
 
     first_participant = match.participants[0]
     expected_first = MATCH_RESPONSE["info"]["participants"][0]
-    assert first_participant.puuid == expected_first["puuid"] #flakey, based on your current api key
+    assert first_participant.puuid == expected_first["puuid"]  # live: flakey, based on your current api key
     assert first_participant.champion == expected_first["championName"]
     assert first_participant.individual_position == expected_first["individualPosition"]
     assert first_participant.team_position == expected_first["teamPosition"]
@@ -1,17 +1,95 @@
 """Logging utility using loguru with automatic file detection and rotation."""
 
-import inspect
 import os
 import sys
+import traceback
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional
 
+import orjson
 from loguru import logger
 
 
+# Logger method used for each accepted level name; unknown levels log as INFO
+_LEVEL_METHODS = {
+    "DEBUG": "debug",
+    "INFO": "info",
+    "WARNING": "warning",
+    "WARN": "warning",
+    "ERROR": "error",
+    "CRITICAL": "critical",
+}
+# Human-readable line format for stdout (and the file when json_format=False)
+_LOG_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | "
+    "<level>{level: <8}</level> | "
+    "<cyan>{extra[file]}</cyan> | "
+    "<level>{message}</level>"
+)
+# Severity of each logger method, to skip messages no sink would accept
+_METHOD_LEVEL_NOS = {method: logger.level(method.upper()).no for method in _LEVEL_METHODS.values()}
+
+
+def _json_format(record: dict) -> str:
+    """
+    Loguru format function for the JSON log file.
+
+    Encodes a flat record with orjson instead of loguru's serialize=True (stdlib json
+    over the full nested record). Stashing the line in extra and returning a format
+    that references it keeps loguru's brace formatting away from the JSON text.
+    """
+    extra = record["extra"]
+    entry = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "file": extra.get("file"),
+        "message": record["message"],
+    }
+    context = {key: value for key, value in extra.items() if key not in ("file", "_json")}
+    if context:
+        entry["extra"] = context
+    if record["exception"] is not None:
+        entry["exception"] = "".join(traceback.format_exception(*record["exception"]))
+    extra["_json"] = orjson.dumps(entry, default=str).decode()
+    return "{extra[_json]}\n"
+
+
+@lru_cache(maxsize=1024)
+def _relative_path(filepath: str) -> str:
+    """
+    Path of a source file relative to its project root (the nearest parent with src/).
+
+    Cached per file, so the filesystem walk runs once per calling file rather than on
+    every log call.
+    """
+    try:
+        # Find project root (where src/ is)
+        current = Path(filepath).resolve()
+        while current.parent != current:
+            if (current / "src").exists():
+                project_root = current
+                break
+            current = current.parent
+        else:
+            project_root = Path.cwd()
+
+        rel_path = Path(filepath).resolve().relative_to(project_root)
+        return str(rel_path)
+    except (ValueError, OSError):
+        # Fallback to just filename if relative path fails
+        return os.path.basename(filepath)
+
+
 class Logger:
     """Centralized logger using loguru with automatic file detection and rotation."""
 
+    # loguru's sinks are process-wide, so they are set up by the first Logger only
+    _configured = False
+    # Lowest level any of those sinks accepts; log() returns early for anything below it.
+    # Set with the sinks, so every instance follows the sinks that actually exist.
+    _min_level_no = 0
+
     @staticmethod
     def _find_project_root() -> Path:
         """
@@ -36,6 +114,7 @@ class Logger:
         max_file_size: str = "100 MB",
         retention: str = "10 days",
         json_format: bool = True,
+        file_level: str = "DEBUG",
     ):
         """
         Initialize the logger.
@@ -46,7 +125,15 @@ class Logger:
             max_file_size: Maximum size before rotation (e.g., "100 MB", "1 GB")
             retention: How long to keep rotated logs (e.g., "10 days", "1 week")
             json_format: Whether to store logs in JSON format (default: True)
+            file_level: Minimum level written to the log file (stdout is always INFO)
+
+        Only the first instance configures the sinks; later instances share them.
         """
+        self.log_to_stdout = log_to_stdout
+
+        if Logger._configured:
+            return
+
         # Remove default handler
         logger.remove()
 
@@ -60,14 +147,6 @@ class Logger:
         # Create log directory if it doesn't exist
         log_path.mkdir(parents=True, exist_ok=True)
 
-        # Configure format with time and file fields
-        log_format = (
-            "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | "
-            "<level>{level: <8}</level> | "
-            "<cyan>{extra[file]}</cyan> | "
-            "<level>{message}</level>"
-        )
-
         # Add file handler with rotation based on size (memory threshold proxy)
         log_file = log_path / "app.log"
         
@@ -75,8 +154,8 @@ class Logger:
             # JSON format for file storage
             logger.add(
                 str(log_file),
-                format="{time} | {level} | {extra[file]} | {message}",
-                serialize=True,  # Serialize to JSON format
+                format=_json_format,  # One orjson-encoded object per line
+                level=file_level,
                 rotation=max_file_size,  # Rotate when file exceeds this size
                 retention=retention,
                 compression="zip",  # Compress old logs to save space
@@ -89,7 +168,8 @@ class Logger:
             # Human-readable format for file storage
             logger.add(
                 str(log_file),
-                format=log_format,
+                format=_LOG_FORMAT,
+                level=file_level,
                 rotation=max_file_size,  # Rotate when file exceeds this size
                 retention=retention,
                 compression="zip",  # Compress old logs to save space
@@ -103,43 +183,32 @@ class Logger:
         if log_to_stdout:
             logger.add(
                 sys.stdout,
-                format=log_format,
+                format=_LOG_FORMAT,
                 colorize=True,
                 level="INFO",
             )
 
-        self.log_to_stdout = log_to_stdout
+        min_level_no = logger.level(file_level.upper()).no
+        if log_to_stdout:
+            min_level_no = min(min_level_no, logger.level("INFO").no)
+        Logger._min_level_no = min_level_no
+        Logger._configured = True
 
-    def _get_calling_file(self, depth: int = 2) -> str:
+    def _get_calling_file(self) -> str:
         """
         Automatically detect the file that called the logger.
 
-        Args:
-            depth: Stack depth to check (2 = caller's caller)
-
         Returns:
             Relative path to the calling file
         """
-        frame = inspect.stack()[depth]
-        filepath = frame.filename
-
-        # Get relative path from project root
-        try:
-            # Find project root (where src/ is)
-            current = Path(filepath).resolve()
-            while current.parent != current:
-                if (current / "src").exists():
-                    project_root = current
-                    break
-                current = current.parent
-            else:
-                project_root = Path.cwd()
-
-            rel_path = Path(filepath).resolve().relative_to(project_root)
-            return str(rel_path)
-        except (ValueError, OSError):
-            # Fallback to just filename if relative path fails
-            return os.path.basename(filepath)
+        # Walk out of this module's frames (log() -> Logger.log -> here, or Logger.info
+        # -> Logger.log -> here) to the first frame of the caller. sys._getframe only
+        # follows f_back pointers, unlike inspect.stack() which builds a FrameInfo (and
+        # reads source lines) for every frame on the stack.
+        frame = sys._getframe(1)
+        while frame.f_back is not None and frame.f_code.co_filename == __file__:
+            frame = frame.f_back
+        return _relative_path(frame.f_code.co_filename)
 
     def log(
         self,
@@ -157,6 +226,11 @@ class Logger:
             file: Optional file name to override automatic detection
             **kwargs: Additional context to include in the log
         """
+        method = _LEVEL_METHODS.get(level.upper(), "info")
+        # Skip caller detection and binding entirely when no sink would take the message
+        if _METHOD_LEVEL_NOS[method] < Logger._min_level_no:
+            return
+
         # Auto-detect file if not provided
         if file is None:
             file = self._get_calling_file()
@@ -165,19 +239,7 @@ class Logger:
         bound_logger = logger.bind(file=file)
 
         # Log with appropriate level
-        level_upper = level.upper()
-        if level_upper == "DEBUG":
-            bound_logger.debug(message, **kwargs)
-        elif level_upper == "INFO":
-            bound_logger.info(message, **kwargs)
-        elif level_upper == "WARNING" or level_upper == "WARN":
-            bound_logger.warning(message, **kwargs)
-        elif level_upper == "ERROR":
-            bound_logger.error(message, **kwargs)
-        elif level_upper == "CRITICAL":
-            bound_logger.critical(message, **kwargs)
-        else:
-            bound_logger.info(message, **kwargs)
+        getattr(bound_logger, method)(message, **kwargs)
 
     def debug(self, message: str, file: Optional[str] = None, **kwargs: Any) -> None:
         """Log a debug message."""
@@ -229,6 +291,7 @@ def get_logger(
     max_file_size: str = "100 MB",
     retention: str = "10 days",
     json_format: bool = True,
+    file_level: str = "DEBUG",
 ) -> Logger:
     """
     Get or create the global logger instance.
@@ -239,6 +302,7 @@ def get_logger(
         max_file_size: Maximum size before rotation
         retention: How long to keep rotated logs
         json_format: Whether to store logs in JSON format (default: True)
+        file_level: Minimum level written to the log file
 
     Returns:
         Logger instance
@@ -251,6 +315,7 @@ def get_logger(
             max_file_size=max_file_size,
             retention=retention,
             json_format=json_format,
+            file_level=file_level,
         )
     return _global_logger
 
@@ -131,62 +131,25 @@ def explain_json_format():
     """
     Explanation of JSON format:
     
-    When json_format=True (default), each log entry in the file is a JSON object like:
-    
-    {
-        "text": "Your message here",
-        "record": {
-            "elapsed": {...},
-            "exception": null,
-            "extra": {
-                "file": "src/utils/logger_example.py"
-            },
-            "file": {
-                "name": "logger_example.py",
-                "path": "/full/path/to/logger_example.py"
-            },
-            "function": "example_simple",
-            "level": {
-                "icon": "ℹ️",
-                "name": "INFO",
-                "no": 20
-            },
-            "line": 15,
-            "message": "Your message here",
-            "module": "logger_example",
-            "name": "root",
-            "process": {
-                "id": 12345,
-                "name": "MainProcess"
-            },
-            "thread": {
-                "id": 140123456789,
-                "name": "MainThread"
-            },
-            "time": {
-                "repr": "2024-01-15 10:30:45.123456+00:00",
-                "timestamp": 1705315845.123456
-            }
-        }
-    }
+    When json_format=True (default), each line of the log file is one flat JSON object:
+    
+    {"time":"2024-01-15T10:30:45.123456+00:00","level":"INFO","file":"src/utils/logger_example.py","message":"Your message here"}
+    
+    - time: ISO 8601 timestamp with the UTC offset
+    - level: level name (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+    - file: path of the calling file relative to the project root
+    - message: the formatted message
     
-    Any **kwargs you pass (like match_id, user_id, etc.) will appear in the "extra" field.
+    Any **kwargs you pass (like match_id, user_id, etc.) are collected under "extra",
+    which is left out when there are none.
     
     Example: log("Fetching match", match_id="123", region="NA1")
     
     Results in:
-    {
-        "text": "Fetching match",
-        "record": {
-            ...
-            "extra": {
-                "file": "src/your_file.py",
-                "match_id": "123",      # <-- Your custom field
-                "region": "NA1"        # <-- Your custom field
-            },
-            ...
-        }
-    }
+    {"time":"...","level":"INFO","file":"src/your_file.py","message":"Fetching match","extra":{"match_id":"123","region":"NA1"}}
+    
+    When an exception is logged (e.g. with logger.exception(...)), its formatted
+    traceback is added as a string under "exception".
     """
 
 
@@ -207,6 +170,6 @@ if __name__ == "__main__":
     print("\n=== Example 5: Configurations ===")
     example_configurations()
     
-    print("\n✅ Examples complete! Check logs/app_*.log for JSON output")
+    print("\n✅ Examples complete! Check logs/app.log for JSON output")
     print("📝 See explain_json_format() docstring for JSON structure details")
 
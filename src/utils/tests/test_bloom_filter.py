@@ -0,0 +1,36 @@
+import pytest
+
+from utils.bloom_filter import BloomFilter
+
+
+def test_added_items_are_always_found():
+    bloom = BloomFilter(capacity=10_000)
+    items = [f"NA1_{i}" for i in range(10_000)]
+    bloom.update(items)
+
+    assert all(item in bloom for item in items)
+    assert len(bloom) == 10_000
+    assert not bloom.is_full
+
+
+def test_false_positive_rate_at_capacity():
+    bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+    bloom.update(f"NA1_{i}" for i in range(10_000))
+
+    false_positives = sum(f"EUW1_{i}" in bloom for i in range(100_000))
+    # Expected ~1000; allow for the sampling noise of 100k lookups
+    assert false_positives / 100_000 < 0.015
+
+
+def test_is_full_once_past_capacity():
+    bloom = BloomFilter(capacity=2)
+    bloom.update(["a", "b"])
+    assert not bloom.is_full
+    bloom.add("c")
+    assert bloom.is_full
+
+
+@pytest.mark.parametrize("capacity, error_rate", [(0, 1e-4), (10, 0), (10, 1)])
+def test_rejects_invalid_parameters(capacity, error_rate):
+    with pytest.raises(ValueError):
+        BloomFilter(capacity, error_rate)
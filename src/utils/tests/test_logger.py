@@ -0,0 +1,19 @@
+from loguru import logger
+
+from utils.logger import Logger
+
+
+def test_later_instances_use_the_configured_sinks_threshold(tmp_path, monkeypatch):
+    monkeypatch.setattr(Logger, "_configured", False)
+    monkeypatch.setattr(Logger, "_min_level_no", 0)
+    try:
+        Logger(log_dir=str(tmp_path), log_to_stdout=False, file_level="DEBUG")
+        # Sinks already exist, so these arguments must not change what gets written
+        later = Logger(log_dir=str(tmp_path / "other"), log_to_stdout=False, file_level="WARNING")
+        later.debug("debug from a later instance")
+        logger.complete()
+
+        assert "debug from a later instance" in (tmp_path / "app.log").read_text()
+        assert not (tmp_path / "other").exists()
+    finally:
+        logger.remove()
@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.util import (
+    RANK_DTYPE,
+    Rank,
+    date_string_to_iso_start_of_day,
+    iso_to_timestamp_s,
+    platform_to_region,
+    rank_num_to_rank_enum,
+    rank_num_to_tier_rank,
+    tier_rank_to_rank_num,
+    tier_rank_to_rank_num_bulk,
+    tier_rank_to_rank_num_fast,
+)
+
+
+def test_rank_num_converters_accept_ints_and_numpy_integers():
+    assert rank_num_to_rank_enum(5) is Rank.BRONZE_III
+    assert rank_num_to_rank_enum(np.int8(5)) is Rank.BRONZE_III
+    assert rank_num_to_rank_enum(np.int64(30)) is Rank.CHALLENGER
+    assert rank_num_to_tier_rank(5) == ("bronze", "III")
+    assert rank_num_to_tier_rank(np.int8(28)) == ("master", None)
+
+
+@pytest.mark.parametrize("convert", [rank_num_to_rank_enum, rank_num_to_tier_rank])
+@pytest.mark.parametrize("value", [True, False, np.bool_(True), 1.0, "1", None])
+def test_rank_num_converters_reject_non_integers(convert, value):
+    with pytest.raises(TypeError):
+        convert(value)
+
+
+@pytest.mark.parametrize("convert", [rank_num_to_rank_enum, rank_num_to_tier_rank])
+@pytest.mark.parametrize("value", [-1, 31, np.int8(-1)])
+def test_rank_num_converters_reject_out_of_range(convert, value):
+    with pytest.raises(ValueError):
+        convert(value)
+
+
+def test_bulk_rank_nums_round_trip_to_rank_enum():
+    rank_nums = tier_rank_to_rank_num_bulk(["GOLD", "diamond", "MASTER"], ["IV", "i", "I"])
+    assert rank_nums.dtype == RANK_DTYPE
+
+    assert [rank_num_to_rank_enum(num) for num in rank_nums] == [
+        Rank.GOLD_IV,
+        Rank.DIAMOND_I,
+        Rank.MASTER,
+    ]
+    assert [rank_num_to_tier_rank(num) for num in rank_nums] == [
+        ("gold", "IV"),
+        ("diamond", "I"),
+        ("master", None),
+    ]
+
+
+@pytest.mark.parametrize(
+    "date_string, expected",
+    [
+        ("2025-11-01", "2025-11-01T00:00:00"),
+        ("2024-02-29", "2024-02-29T00:00:00"),
+        ("2025-1-5", "2025-01-05T00:00:00"),
+    ],
+)
+def test_date_string_to_iso_start_of_day(date_string, expected):
+    assert date_string_to_iso_start_of_day(date_string) == expected
+
+
+@pytest.mark.parametrize(
+    "date_string",
+    ["20250101", "2025-W01-1", "2025-13-01", "2025-02-30", "2025/01/01", "01-01-2025", ""],
+)
+def test_date_string_to_iso_start_of_day_rejects_other_formats(date_string):
+    with pytest.raises(ValueError, match="Expected YYYY-MM-DD"):
+        date_string_to_iso_start_of_day(date_string)
+
+
+def test_bulk_matches_scalar_conversion():
+    tiers = ["iron", " Gold ", "PLAT", "diamond", "master", "GRANDMASTER", "challenger"]
+    ranks = ["IV", "ii", " I", "I", None, "I", ""]
+    expected = [tier_rank_to_rank_num(tier, rank) for tier, rank in zip(tiers, ranks)]
+
+    assert tier_rank_to_rank_num_bulk(tiers, ranks).tolist() == expected
+    # Series keep working whatever their index
+    assert tier_rank_to_rank_num_bulk(
+        pd.Series(tiers, index=range(10, 17)), pd.Series(ranks, index=range(7))
+    ).tolist() == expected
+    assert tier_rank_to_rank_num_bulk([], []).tolist() == []
+
+
+@pytest.mark.parametrize(
+    "tiers, ranks, message",
+    [
+        (["gold", "unranked"], ["I", "I"], "Unknown tier 'unranked'"),
+        (["gold", None], ["I", "I"], "tier must be provided"),
+        (["gold", pd.NA], ["I", "I"], "tier must be provided"),
+        (["gold"], [None], "requires a rank value"),
+        (["gold"], ["V"], "Unknown rank 'V'"),
+        (["master"], ["II"], "does not use ranks"),
+        (["gold", "gold"], ["I"], "same length"),
+    ],
+)
+def test_bulk_rejects_invalid_pairs(tiers, ranks, message):
+    with pytest.raises(ValueError, match=message):
+        tier_rank_to_rank_num_bulk(tiers, ranks)
+
+
+def test_fast_conversion_uses_exact_api_spellings():
+    assert tier_rank_to_rank_num_fast("GOLD", "IV") == tier_rank_to_rank_num("gold", "IV")
+    assert tier_rank_to_rank_num_fast("PLATINUM", "I") == tier_rank_to_rank_num("plat", "I")
+    assert tier_rank_to_rank_num_fast("CHALLENGER", "I") == Rank.CHALLENGER
+    assert tier_rank_to_rank_num_fast("MASTER") == Rank.MASTER
+    with pytest.raises(KeyError):
+        tier_rank_to_rank_num_fast("gold", "IV")
+
+
+def test_platform_to_region():
+    assert platform_to_region("NA1") == "americas"
+    assert platform_to_region("euw1") == "europe"
+    assert platform_to_region("Kr") == "asia"
+    with pytest.raises(ValueError, match="Unknown platform"):
+        platform_to_region("XX1")
+
+
+def test_iso_to_timestamp_s_reads_naive_times_as_utc():
+    assert iso_to_timestamp_s("1970-01-01T00:00:00") == 0
+    assert iso_to_timestamp_s("2025-11-01T00:00:00") == 1761955200
+    # Aware times keep their own offset
+    assert iso_to_timestamp_s("2025-11-01T02:00:00+02:00") == 1761955200
@@ -1,10 +1,17 @@
 """General utility helpers for rank tier conversions."""
 
 import datetime
-from enum import Enum
-from typing import Optional, Tuple
+import operator
+from enum import Enum, IntEnum
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Iterable, NoReturn, Optional, Tuple
 
-PLATFORM_TO_REGION = {
+import numpy as np
+import pandas as pd
+
+# Read-only: the cached platform_to_region results must not go stale
+PLATFORM_TO_REGION = MappingProxyType({
     "NA1": "americas",
     "BR1": "americas",
     "LA1": "americas",
@@ -20,10 +27,33 @@ PLATFORM_TO_REGION = {
     "VN2": "sea",
     "JP1": "asia",
     "KR": "asia",
-}
+})
+_PLATFORM_TO_REGION_CI = {platform.upper(): region for platform, region in PLATFORM_TO_REGION.items()}
+
+
+@lru_cache(maxsize=64)
+def platform_to_region(platform: str) -> str:
+    """
+    Return the regional routing value (e.g. "americas") for a platform such as "NA1".
+
+    Case-insensitive; the result is cached per spelling, so repeat calls skip .upper().
+    """
+    try:
+        return _PLATFORM_TO_REGION_CI[platform.upper()]
+    except KeyError:
+        raise ValueError(f"Unknown platform '{platform}'") from None
+
 
-class Rank(Enum):
-    """Enum representing all individual ranks in League of Legends with numeric values."""
+class Rank(IntEnum):
+    """
+    Enum representing all individual ranks in League of Legends with numeric values.
+
+    Members are ints, so they compare and do arithmetic directly (Rank.GOLD_I < 20)
+    without going through .value.
+    """
+
+    # Keep str()/f-strings as "Rank.GOLD_I" rather than IntEnum's bare "15"
+    __str__ = Enum.__str__
 
     # Iron ranks (0-3)
     IRON_IV = 0
@@ -84,66 +114,160 @@ _TIERS_WITH_DIVISIONS = (
     "diamond",
 )
 
+# Single-division tiers above diamond, lowest first
+_APEX_TIERS = ("master", "grandmaster", "challenger")
+_TIERS = _TIERS_WITH_DIVISIONS + _APEX_TIERS
+
 # Lowest (IV) to highest (I) division ordering keeps rank numbers increasing with skill.
 _DIVISION_ORDER = ("IV", "III", "II", "I")
 
-_ORDERED_RANKS = [
-    (tier, division) for tier in _TIERS_WITH_DIVISIONS for division in _DIVISION_ORDER
-]
-_ORDERED_RANKS.extend(
-    [
-        ("master", None),
-        ("grandmaster", None),
-        ("challenger", None),
-    ]
+_ORDERED_RANKS = tuple(
+    [(tier, division) for tier in _TIERS_WITH_DIVISIONS for division in _DIVISION_ORDER]
+    + [(tier, None) for tier in _APEX_TIERS]
 )
+_NUM_RANKS = len(_ORDERED_RANKS)
 
-_VALID_TIERS = {tier for tier, _ in _ORDERED_RANKS}
-_TIER_RANK_TO_NUM = {
+# Lookup tables are fixed at import (several functions below cache results derived from
+# them); the public-facing ones are read-only views
+_VALID_TIERS = frozenset(_TIERS)
+_DIVISION_TIERS = frozenset(_TIERS_WITH_DIVISIONS)
+_TIER_RANK_TO_NUM = MappingProxyType({
     (tier, division): index for index, (tier, division) in enumerate(_ORDERED_RANKS)
-}
-
-
+})
+# _TIER_RANK_LOOKUP: every accepted (normalized tier, normalized rank) spelling mapped
+# straight to its number, so valid input resolves with a single lookup. Apex tiers also
+# accept "I" and a blank rank, matching the errors in _raise_tier_rank_error.
+# _TIER_RANK_TO_NUM_FAST: exact Riot API spellings ("GOLD", "IV"; apex tiers with rank
+# "I" or None), with no normalization; the API calls platinum "PLATINUM", not "plat".
+_TIER_RANK_LOOKUP: dict[Tuple[str, Optional[str]], int] = {}
+_TIER_RANK_TO_NUM_FAST: dict[Tuple[str, Optional[str]], int] = {}
+for (_tier, _division), _index in _TIER_RANK_TO_NUM.items():
+    _api_tiers = (_tier.upper(), "PLATINUM") if _tier == "plat" else (_tier.upper(),)
+    _divisions = (_division,) if _division is not None else (None, "I", "")
+    for _alias in _divisions:
+        _TIER_RANK_LOOKUP[(_tier, _alias)] = _index
+        if _alias != "":
+            for _api_tier in _api_tiers:
+                _TIER_RANK_TO_NUM_FAST[(_api_tier, _alias)] = _index
+# Rank values are contiguous from 0, so a rank number indexes straight into this tuple
+_RANK_BY_NUM = tuple(sorted(Rank, key=lambda rank_enum: rank_enum.value))
+# Array/column dtype for rank numbers: 0..30 fits in one byte
+RANK_DTYPE = np.int8
+
+# Integer codes for the vectorized conversion: a division tier's rank number is
+# tier_code * 4 + division_code, and apex tiers follow on from diamond I
+_TIER_CODE = {tier: code for code, tier in enumerate(_TIERS)}
+_DIVISION_CODE = {division: code for code, division in enumerate(_DIVISION_ORDER)}
+_NUM_DIVISION_TIERS = len(_TIERS_WITH_DIVISIONS)
+
+
+# Inputs come from a few dozen spellings, so repeat calls are one cache hit; the lookup
+# tables never change after import, so cached results cannot go stale
+@lru_cache(maxsize=256)
 def tier_rank_to_rank_num(tier: str, rank: Optional[str] = None) -> int:
     """Convert a (tier, rank) pair to its numeric ordering."""
     if not tier:
         raise ValueError("tier must be provided")
     normalized_tier = tier.strip().lower()
 
+    # Every valid spelling is in the lookup table, so a miss is always an error
+    rank_num = _TIER_RANK_LOOKUP.get((normalized_tier, rank.strip().upper() if rank else None))
+    if rank_num is None:
+        _raise_tier_rank_error(tier, rank, normalized_tier)
+    return rank_num
+
+
+def _raise_tier_rank_error(tier: str, rank: Optional[str], normalized_tier: str) -> NoReturn:
+    """Raise the ValueError describing why (tier, rank) is not a valid rank."""
     if normalized_tier not in _VALID_TIERS:
         raise ValueError(f"Unknown tier '{tier}'")
-
-    normalized_rank: Optional[str]
-    if normalized_tier in _TIERS_WITH_DIVISIONS:
+    if normalized_tier in _DIVISION_TIERS:
         if not rank:
             raise ValueError(f"Tier '{tier}' requires a rank value")
-        normalized_rank = rank.strip().upper()
-        if normalized_rank not in _DIVISION_ORDER:
-            raise ValueError(f"Unknown rank '{rank}' for tier '{tier}'")
-    else:
-        normalized_rank = None
-        if rank:
-            normalized_rank_candidate = rank.strip().upper()
-            if normalized_rank_candidate and normalized_rank_candidate != "I":
-                raise ValueError(f"Tier '{tier}' does not use ranks, received '{rank}'")
-
-    key = (normalized_tier, normalized_rank)
-    if key not in _TIER_RANK_TO_NUM:
+        raise ValueError(f"Unknown rank '{rank}' for tier '{tier}'")
+    raise ValueError(f"Tier '{tier}' does not use ranks, received '{rank}'")
+
+
+def tier_rank_to_rank_num_fast(tier: str, rank: Optional[str] = None) -> int:
+    """
+    Single-lookup tier_rank_to_rank_num for trusted Riot API payloads.
+
+    Skips all normalization and validation: tier and rank must be spelled exactly as the
+    API sends them ("GOLD", "IV"). Raises KeyError for anything else; callers that may
+    see other spellings can catch it and fall back to tier_rank_to_rank_num.
+    """
+    return _TIER_RANK_TO_NUM_FAST[(tier, rank)]
+
+
+def tier_rank_to_rank_num_bulk(
+    tiers: Iterable[str], ranks: Iterable[Optional[str]]
+) -> np.ndarray:
+    """
+    Vectorized tier_rank_to_rank_num for whole columns (e.g. DataFrame ingestion).
+
+    Accepts the same spellings as the scalar version and raises the same ValueError
+    for the first invalid pair.
+
+    Returns:
+        RANK_DTYPE (int8) array of rank numbers
+    """
+    tiers = pd.Series(tiers, dtype="string").reset_index(drop=True)
+    ranks = pd.Series(ranks, dtype="string").reset_index(drop=True)
+    if len(tiers) != len(ranks):
+        raise ValueError("tiers and ranks must have the same length")
+    rank_keys = ranks.str.strip().str.upper().fillna("")
+    # Unknown tiers/divisions map to NaN and are caught by the validity mask below
+    tier_codes = tiers.str.strip().str.lower().map(_TIER_CODE).to_numpy(dtype=np.float64)
+    division_codes = rank_keys.map(_DIVISION_CODE).to_numpy(dtype=np.float64)
+
+    has_divisions = tier_codes < _NUM_DIVISION_TIERS
+    # Apex tiers accept "I" as well as no rank
+    apex_rank_ok = rank_keys.isin(["", "I"]).to_numpy()
+    valid = ~np.isnan(tier_codes) & np.where(has_divisions, ~np.isnan(division_codes), apex_rank_ok)
+    if not valid.all():
+        # Re-run the first bad pair through the scalar path for its error message
+        index = int(np.flatnonzero(~valid)[0])
+        tier, rank = tiers[index], ranks[index]
+        tier_rank_to_rank_num(None if pd.isna(tier) else tier, None if pd.isna(rank) else rank)
+        # The scalar path accepted a pair the vectorized checks rejected; never let the
+        # NaN codes through as garbage rank numbers
         raise ValueError(f"Unsupported tier/rank combination: tier='{tier}', rank='{rank}'")
-    return _TIER_RANK_TO_NUM[key]
 
+    rank_nums = np.where(
+        has_divisions,
+        tier_codes * len(_DIVISION_ORDER) + division_codes,
+        _NUM_DIVISION_TIERS * (len(_DIVISION_ORDER) - 1) + tier_codes,
+    )
+    return rank_nums.astype(RANK_DTYPE)
 
-def rank_num_to_tier_rank(rank_num: int) -> Tuple[str, Optional[str]]:
-    """Return the (tier, rank) tuple for a given numeric rank."""
-    if not isinstance(rank_num, int):
+
+def _rank_index(rank_num: int) -> int:
+    """
+    Validate a rank number's type and return it as a plain int.
+
+    operator.index accepts ints, Rank members and NumPy integers (e.g. elements of a
+    RANK_DTYPE array) but not floats; bools are ints to Python, so they are rejected
+    explicitly.
+    """
+    if isinstance(rank_num, (bool, np.bool_)):
         raise TypeError("rank_num must be an integer")
-    if rank_num < 0 or rank_num >= len(_ORDERED_RANKS):
-        raise ValueError(f"rank_num must be between 0 and {len(_ORDERED_RANKS) - 1}")
+    try:
+        return operator.index(rank_num)
+    except TypeError:
+        raise TypeError("rank_num must be an integer") from None
 
-    tier, rank = _ORDERED_RANKS[rank_num]
-    return tier, rank
+
+# typed=True so e.g. True never hits the cached entry for 1
+@lru_cache(maxsize=64, typed=True)
+def rank_num_to_tier_rank(rank_num: int) -> Tuple[str, Optional[str]]:
+    """Return the (tier, rank) tuple for a given numeric rank (cached per rank_num)."""
+    index = _rank_index(rank_num)
+    if 0 <= index < _NUM_RANKS:
+        return _ORDERED_RANKS[index]
+    raise ValueError(f"rank_num must be between 0 and {_NUM_RANKS - 1}")
 
 
+@lru_cache(maxsize=256)
 def tier_rank_to_rank_enum(tier: str, rank: Optional[str] = None) -> Rank:
     """Convert a (tier, rank) pair to its corresponding Rank enum."""
     rank_num = tier_rank_to_rank_num(tier, rank)
@@ -152,12 +276,11 @@ def tier_rank_to_rank_enum(tier: str, rank: Optional[str] = None) -> Rank:
 
 def rank_num_to_rank_enum(rank_num: int) -> Rank:
     """Convert a numeric rank to its corresponding Rank enum."""
-    # Find the enum member with the matching numeric value
-    for rank_enum in Rank:
-        if rank_enum.value == rank_num:
-            return rank_enum
-
-    raise ValueError(f"No enum found for rank_num={rank_num}")
+    index = _rank_index(rank_num)
+    # Bounds check first: a negative index would silently wrap around
+    if index < 0 or index >= _NUM_RANKS:
+        raise ValueError(f"No enum found for rank_num={rank_num}")
+    return _RANK_BY_NUM[index]
 
 
 def rank_enum_to_tier_rank(rank_enum: Rank) -> Tuple[str, Optional[str]]:
@@ -168,27 +291,50 @@ def rank_enum_to_tier_rank(rank_enum: Rank) -> Tuple[str, Optional[str]]:
 
 def rank_enum_to_rank_num(rank_enum: Rank) -> int:
     """Convert a Rank enum to its numeric rank."""
-    return rank_enum.value
+    return int(rank_enum)
 
 
+# Game start/end times and query windows repeat many times per run. Both conversions
+# depend only on the process-local timezone, which does not change while running.
+@lru_cache(maxsize=4096)
 def timestamp_s_to_iso(timestamp_s: int) -> str:
     """Convert second timestamp to ISO 8601 format."""
     dt = datetime.datetime.fromtimestamp(timestamp_s)
     return dt.isoformat()
 
 
+_EPOCH = datetime.datetime(1970, 1, 1)
+_ONE_SECOND = datetime.timedelta(seconds=1)
+
+
+@lru_cache(maxsize=4096)
 def iso_to_timestamp_s(iso_string: str) -> int:
-    """Convert ISO 8601 format to second timestamp."""
+    """
+    Convert ISO 8601 format to second timestamp, reading naive times as UTC.
+
+    Riot's timestamps are UTC epochs, so naive times are taken as UTC rather than the
+    machine's local time, and the result does not depend on where the crawl runs. Naive
+    input is plain timedelta arithmetic from the epoch, without the local-time lookup
+    datetime.timestamp() does. Aware times keep their own offset.
+    """
     dt = datetime.datetime.fromisoformat(iso_string)
+    if dt.tzinfo is None:
+        return (dt - _EPOCH) // _ONE_SECOND
     return int(dt.timestamp())
 
 
 def date_string_to_iso_start_of_day(date_string: str) -> str:
     """Convert a simple date string (YYYY-MM-DD) to ISO 8601 format at start of day."""
     try:
-        # Parse the date string
-        dt = datetime.datetime.strptime(date_string, "%Y-%m-%d")
-        # Return ISO format (start of day - 00:00:00)
-        return dt.isoformat()
+        if len(date_string) == 10 and date_string[4] == "-" and date_string[7] == "-":
+            # Zero-padded YYYY-MM-DD: the C-implemented ISO parser. The shape check keeps
+            # out the other forms fromisoformat accepts ("20250101", "2025-W01-1")
+            date = datetime.date.fromisoformat(date_string)
+            dt = datetime.datetime(date.year, date.month, date.day)
+        else:
+            # Anything else (e.g. unpadded "2025-1-5") goes through strptime as before
+            dt = datetime.datetime.strptime(date_string, "%Y-%m-%d")
     except ValueError as e:
         raise ValueError(f"Invalid date format '{date_string}'. Expected YYYY-MM-DD format.") from e
+    # Return ISO format (start of day - 00:00:00)
+    return dt.isoformat()